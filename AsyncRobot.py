@@ -1,10 +1,27 @@
 import asyncio
-import datetime
 import hal
+import json
 import logging
+from time import perf_counter
+import RobotLog
+
+from BootProfiler import BootProfiler
 
 from wpilib.iterativerobotbase import IterativeRobotBase
+from Clock import Clock, VirtualClock
 from Command import Command
+from CommandPool import count_allocations
+from CommandProfiler import CommandProfiler
+from ControlExecutor import ControlExecutor
+from DashboardPublisher import DashboardPublisher
+from DeferredSetup import DeferredSetup
+from Events import Events
+from LoopPhases import LoopPhases
+from LoopTimer import LoopTimer, OverrunPolicy
+from OutputBuffer import OutputBuffer
+from Scheduler import Scheduler
+from SensorSnapshot import SensorSnapshot
+from TelemetryRecorder import TelemetryRecorder
 
 __all__ = ["AsyncRobot"]
 
@@ -14,29 +31,263 @@ class AsyncRobot(IterativeRobotBase):
     The AsyncRobot class is intended to be subclassed by a user creating a robot program.
 
     The asyncio Event loop schedules loopFunc() and periodic()
-    functions, instead of being run directly.
+    functions, instead of being run directly. Every registered sensor is
+    sampled once at the top of each loop. Commands started with
+    start_command() are stepped by a single Scheduler once per loop,
+    right after the mode-dependent periodic function. Coalesced events are
+    then delivered once, and every buffered motor and solenoid write is
+    flushed in one batch at the end.
+
+    Every command is timed by the CommandProfiler; its summary is pushed to
+    SmartDashboard while running and the full histograms are written to
+    disk each time the robot is disabled.
+
+    Dashboard values are sent by the DashboardPublisher's own thread, never
+    from the robot loop; the running commands are published under
+    commands/running.
+
+    PID loops run on the ControlExecutor's single thread every
+    CONTROL_PERIOD; commands read their outputs from the main loop.
+
+    When TELEMETRY_DIR is set, one binary telemetry record is written at the
+    end of every loop; see TelemetryRecorder.
+
+    With CHECK_ALLOCATIONS set, a warning is logged for every teleop loop
+    past the first ALLOCATION_WARMUP that builds a new Command; steady-state
+    teleop should get all of its commands from the CommandPool.
+
+    The robot reports ready to the driver station as soon as robotInit()
+    returns. With FAST_BOOT set, work handed to DeferredSetup runs on a
+    background thread after that point instead of before it, and the
+    BootProfiler's import and construction times are logged once ready.
+
+    Each loop is paced by absolute deadlines on the installed Clock;
+    OVERRUN_POLICY decides what happens when a loop runs past its deadline.
+    With a VirtualClock installed, simulate() runs the loop on virtual time
+    as fast as the CPU allows.
+
+    Every phase of the loop is timed by LoopPhases, and an overrun logs one
+    JSON report with the phase times, the slowest phase and the running
+    commands. Reports are at most one per OVERRUN_REPORT_INTERVAL; the
+    overruns in between are counted in the next one.
     """
     DEFAULT_PERIOD = .02
+    OVERRUN_POLICY = OverrunPolicy.SKIP
+    CONTROL_PERIOD = .005
+    CHECK_ALLOCATIONS = False
+    FAST_BOOT = True
+    ALLOCATION_WARMUP = 50
+    OVERRUN_REPORT_INTERVAL = 1.0
+    # in the order they run; live_window is the rest of loopFunc() after robotPeriodic()
+    LOOP_PHASES = (
+        "sensors", "periodic", "robot_periodic", "live_window", "commands",
+        "events", "outputs", "telemetry", "profile"
+    )
+    LOG_PATH = None
+    TELEMETRY_DIR = "telemetry"
     logger = logging.getLogger("robot")
 
     def __init__(self):
         super().__init__()
+        RobotLog.setup(type(self).LOG_PATH)
         hal.report(hal.UsageReporting.kResourceType_Framework, hal.UsageReporting.kFramework_Iterative)
 
         self._loop = asyncio.get_event_loop()
+        self.clock = Clock.getInstance()
+        self.scheduler = Scheduler.getInstance()
+        self.sensors = SensorSnapshot.getInstance()
+        self.outputs = OutputBuffer.getInstance()
+        self.profiler = CommandProfiler.getInstance()
+        self.telemetry = TelemetryRecorder.getInstance()
+        self.control = ControlExecutor.getInstance()
+        self.dashboard = DashboardPublisher.getInstance()
+        self.boot = BootProfiler.getInstance()
+        self.deferred = DeferredSetup.getInstance()
+        self.loop_timer = LoopTimer(type(self).DEFAULT_PERIOD, type(self).OVERRUN_POLICY, self.clock)
+        self.phases = LoopPhases(type(self).LOOP_PHASES)
+        self._was_disabled = True
+        self._teleop_ticks = 0
+        self._next_report = 0.0
+        self._unreported_overruns = 0
+        self._time_robot_periodic()
+
+    def start_command(self, command: Command) -> None:
+        """Schedule a command to be stepped from the next loop on."""
+        self.scheduler.add(command)
 
     def startCompetition(self) -> None:
         """Provide an alternate "main loop" via startCompetition()"""
         self.robotInit()
+        self._start_telemetry()
+        self.control.start(type(self).CONTROL_PERIOD)
+        self._start_dashboard()
+        if not type(self).FAST_BOOT:
+            self.deferred.run_all()
         hal.observeUserProgramStarting()
+        self.boot.mark("ready")
+        self.deferred.start()
+        self.boot.report()
 
         # Loop forever, calling the appropriate mode-dependent function
         self._loop.run_until_complete(self._run_robot())
 
+    def simulate(self, seconds: float) -> None:
+        """Run the robot loop for the given amount of virtual time, without sleeping.
+
+        Requires a VirtualClock; robotInit() must already have been called.
+        The control loops are stepped in between, at CONTROL_PERIOD.
+        """
+        clock = self.clock
+        if not isinstance(clock, VirtualClock):
+            raise RuntimeError("simulate() needs a VirtualClock installed")
+
+        control = self.control
+        control_period = type(self).CONTROL_PERIOD
+        end = clock.now() + seconds
+        while clock.now() < end:
+            wait = self._step()
+            while wait > 0:
+                control.step(control_period)
+                clock.advance(min(wait, control_period))
+                wait -= control_period
+
     async def _run_robot(self):
+        clock = self.clock
         while True:
-            start = datetime.now()
+            await clock.sleep(self._step())
+
+    def _step(self) -> float:
+        """Run one loop. Returns the seconds until the next one is due."""
+        timer = self.loop_timer
+        phases = self.phases
+        timer.begin()
+        phases.begin()
+        self.sensors.sample()
+        phases.lap("sensors")
+        if type(self).CHECK_ALLOCATIONS:
+            self._checked_loop()
+        else:
             self.loopFunc()
-            elapsed = min(AsyncRobot.DEFAULT_PERIOD, (datetime.now() - start).seconds)
-            
-            await asyncio.sleep(AsyncRobot.DEFAULT_PERIOD - elapsed)
\ No newline at end of file
+            phases.lap("live_window")
+            self.scheduler.run()
+            phases.lap("commands")
+        Events.flush()
+        phases.lap("events")
+        self.outputs.flush()
+        phases.lap("outputs")
+        self.telemetry.record()
+        phases.lap("telemetry")
+
+        disabled = self.isDisabled()
+        if disabled and not self._was_disabled:
+            self._dump_profile()
+            self.telemetry.rotate()
+        self._was_disabled = disabled
+        self.profiler.periodic()
+        phases.lap("profile")
+
+        overruns = timer.overruns
+        wait = timer.end()
+        if timer.overruns != overruns:
+            self._report_overrun()
+        return wait
+
+    def _checked_loop(self) -> None:
+        phases = self.phases
+        with count_allocations() as allocations:
+            self.loopFunc()
+            phases.lap("live_window")
+            self.scheduler.run()
+            phases.lap("commands")
+
+        if not self.isOperatorControl() or not self.isEnabled():
+            self._teleop_ticks = 0
+            return
+        self._teleop_ticks += 1
+        if allocations.count and self._teleop_ticks > type(self).ALLOCATION_WARMUP:
+            self.logger.warning("teleop loop %d built %d new commands", self._teleop_ticks, allocations.count)
+
+    def _time_robot_periodic(self) -> None:
+        # loopFunc() runs the mode's periodic function and then robotPeriodic();
+        # wrapping robotPeriodic() splits the two into phases
+        phases = self.phases
+        robot_periodic = self.robotPeriodic
+
+        def timed_robot_periodic():
+            phases.lap("periodic")
+            robot_periodic()
+            phases.lap("robot_periodic")
+        self.robotPeriodic = timed_robot_periodic
+
+    def _mode(self) -> str:
+        if self.isDisabled():
+            return "disabled"
+        if self.isAutonomous():
+            return "autonomous"
+        if self.isTest():
+            return "test"
+        return "teleop"
+
+    def _report_overrun(self) -> None:
+        self._unreported_overruns += 1
+        now = perf_counter()
+        if now < self._next_report:
+            return
+        self._next_report = now + type(self).OVERRUN_REPORT_INTERVAL
+
+        phases = self.phases
+        commands = sorted(self.scheduler.running, key=lambda command: command.last_tick, reverse=True)
+        report = {
+            "tick": self.loop_timer.ticks,
+            "mode": self._mode(),
+            "overruns": self._unreported_overruns,
+            "loop_ms": round(phases.elapsed * 1000, 3),
+            "period_ms": self.loop_timer.period * 1000,
+            "slowest": phases.slowest().name,
+            "phases_ms": {phase.name: round(phase.last * 1000, 3) for phase in phases.last_tick()},
+            "commands_ms": [[type(command).__name__, round(command.last_tick * 1000, 3)] for command in commands]
+        }
+        self._unreported_overruns = 0
+        self.logger.warning("loop overrun %s", json.dumps(report))
+        self.dashboard.put("loop/last_overrun_phase", report["slowest"])
+
+    def _start_telemetry(self) -> None:
+        directory = type(self).TELEMETRY_DIR
+        if directory is None:
+            return
+
+        telemetry = self.telemetry
+        timer = self.loop_timer
+        scheduler = self.scheduler
+        telemetry.add("tick", lambda: timer.ticks, "I")
+        telemetry.add("time", lambda: timer.last_start, "d")
+        telemetry.add("active_commands", lambda: telemetry.command_mask(scheduler.running), "Q")
+
+        try:
+            telemetry.start(directory, type(self).DEFAULT_PERIOD)
+        except OSError:
+            self.logger.exception("Could not start telemetry")
+
+    def _start_dashboard(self) -> None:
+        scheduler = self.scheduler
+        self.dashboard.add(
+            "commands/running",
+            lambda: ", ".join(type(command).__name__ for command in scheduler.running),
+            0.25
+        )
+        for phase in self.phases.phases:
+            self.dashboard.add(
+                "loop/" + phase.name + "_p99_ms",
+                lambda phase=phase: phase.percentile(99) * 1000,
+                1.0,
+                epsilon=0.01
+            )
+        self.dashboard.start()
+
+    def _dump_profile(self) -> None:
+        self.logger.info("loop phases %s", json.dumps(self.phases.stats()))
+        try:
+            self.profiler.dump()
+            self.boot.dump()
+        except OSError:
+            self.logger.exception("Could not write command profile")
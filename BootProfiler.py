@@ -0,0 +1,139 @@
+import json
+import logging
+import sys
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+__all__ = ["BootProfiler"]
+
+logger = logging.getLogger("robot.boot")
+
+
+class _ImportTimer():
+    """Meta path finder that times the module body of every import after it."""
+
+    def __init__(self, profiler: "BootProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # Builtin and frozen importers are shared classes; only per-module
+        # loader instances are wrapped.
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+
+        exec_module = loader.exec_module
+        profiler = self._profiler
+
+        def timed_exec_module(module):
+            with profiler.timing("import", name):
+                exec_module(module)
+        loader.exec_module = timed_exec_module
+        return spec
+
+
+class BootProfiler():
+    """Where the time between process start and robot ready goes.
+
+    install() hooks the import system, so every module imported afterwards is
+    timed; robot.py installs it before anything else is imported. Component
+    construction and deferred setup are timed with timing(). Times are
+    inclusive ("total") and with nested entries subtracted ("self"), kept
+    per thread so the DeferredSetup thread is timed alongside the main one.
+    mark() records milestones such as "ready". report() logs the slowest
+    entries and dump() writes all of them out.
+    """
+    DUMP_PATH = "boot_profile.json"
+
+    _instance = None
+
+    _entries: Dict[Tuple[str, str], List[float]]
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.marks = {}
+        self._entries = {}
+        self._local = threading.local()
+        self._finder = None
+
+    @staticmethod
+    def getInstance() -> "BootProfiler":
+        if BootProfiler._instance is None:
+            BootProfiler._instance = BootProfiler()
+        return BootProfiler._instance
+
+    def install(self) -> None:
+        if self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    @contextmanager
+    def timing(self, kind: str, name: str):
+        """Time a block as (kind, name), e.g. ("component", "lifter_component")."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        children = [0.0]
+        stack.append(children)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            entry = self._entries.get((kind, name))
+            if entry is None:
+                entry = self._entries[(kind, name)] = [0.0, 0.0]
+            entry[0] += elapsed
+            entry[1] += elapsed - children[0]
+
+    def mark(self, name: str) -> float:
+        """Record a milestone. Returns the seconds since the profiler was created."""
+        elapsed = self.marks[name] = perf_counter() - self.start
+        return elapsed
+
+    def entries(self, kind: str = None) -> List[Tuple[str, str, float, float]]:
+        """(kind, name, total, self) of every entry, slowest self time first."""
+        entries = [
+            (entry_kind, name, total, own)
+            for (entry_kind, name), (total, own) in self._entries.items()
+            if kind is None or entry_kind == kind
+        ]
+        entries.sort(key=lambda entry: entry[3], reverse=True)
+        return entries
+
+    def report(self, top: int = 10) -> None:
+        for name, elapsed in self.marks.items():
+            logger.info("boot %s at %.0f ms", name, elapsed * 1000)
+        for kind in ("import", "component", "deferred"):
+            for _, name, total, own in self.entries(kind)[:top]:
+                logger.info("%s %s: %.1f ms (%.1f ms total)", kind, name, own * 1000, total * 1000)
+
+    def dump(self, path: str = None) -> None:
+        report = {
+            "marks": self.marks,
+            "entries": [
+                {"kind": kind, "name": name, "total": total, "self": own}
+                for kind, name, total, own in self.entries()
+            ]
+        }
+        with open(path or BootProfiler.DUMP_PATH, "w") as f:
+            json.dump(report, f, indent=1)
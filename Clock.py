@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+__all__ = ["Clock", "VirtualClock", "Timer"]
+
+class Clock():
+    """The time source for AsyncRobot, the Scheduler and command timers.
+
+    The default clock is time.monotonic(). Install a VirtualClock with
+    Clock.set_instance() before the robot is built to run the robot loop on
+    simulated time, as fast as the CPU allows.
+    """
+    _instance = None
+
+    @staticmethod
+    def getInstance() -> "Clock":
+        if Clock._instance is None:
+            Clock._instance = Clock()
+        return Clock._instance
+
+    @staticmethod
+    def set_instance(clock: "Clock") -> None:
+        Clock._instance = clock
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Simulated time that only moves when the loop sleeps or advance() is called."""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        if seconds > 0:
+            self._now += seconds
+
+    async def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+        await asyncio.sleep(0)
+
+
+class Timer():
+    """Stopwatch on the installed Clock, with the parts of wpilib.Timer the commands use."""
+
+    def __init__(self):
+        self._clock = Clock.getInstance()
+        self._start_time = 0.0
+        self._accumulated = 0.0
+        self._running = False
+
+    def get(self) -> float:
+        if self._running:
+            return self._accumulated + self._clock.now() - self._start_time
+        return self._accumulated
+
+    def reset(self) -> None:
+        self._accumulated = 0.0
+        self._start_time = self._clock.now()
+
+    def start(self) -> None:
+        if not self._running:
+            self._start_time = self._clock.now()
+            self._running = True
+
+    def stop(self) -> None:
+        self._accumulated = self.get()
+        self._running = False
+
+    def hasPeriodPassed(self, period: float) -> bool:
+        """True once period has passed; the timer then moves on by period, like wpilib.Timer."""
+        if self.get() > period:
+            self._start_time += period
+            return True
+        return False
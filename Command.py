@@ -1,126 +1,143 @@
-import asyncio
-import datetime
+from time import perf_counter
 from typing import Callable
+from CommandProfiler import CommandProfiler, CommandProfile
+from Subsystem import Subsystem
+
 
 class Command():
     DEFAULT_PERIOD = 0.02
+    # Number of Command instances ever built; see CommandPool.count_allocations.
+    created = 0
+    _profile: CommandProfile = None
+    priority = 0
+    requirements = 0
+    # seconds the last _tick() took, for the loop overrun report
+    last_tick = 0.0
 
-    def __init__(self, persistent=False: bool):
+    def __init__(self, persistent: bool = False, priority: int = 0):
+        """A command with a higher priority preempts one holding the same
+        subsystems; an equal priority preempts too, a lower one waits."""
+        Command.created += 1
         self.components = []
-        self.elapsed_time = 0.0
-        self.interrupt_event = None
+        self.requirements = 0
         self.persistent = persistent
-        self.task = None
-    
-    
-    # Coroutines
-    async def _run(self):
-        """Coroutine run on the event loop"""
-        
-        self._initialize()
-
-        while True:
-            if self.isFinished():
-                self._end()
-                break
-            elif self.interrupt_event.is_set():
-                self.interrupted()
-                self._release_resources()
-
-                if self.persistent:
-                    await self._suspend()
-                else:
-                    self._terminate()
-                    break
-            
-            self._execute()
-            await asyncio.sleep(Command.DEFAULT_PERIOD - self.elapsed_time)
-        
-        return
-    
-    async def _suspend(self):
-        await asyncio.sleep(0)
-        while self._check_resources():
-            await asyncio.wait([component.wait() for component in self.components])
-        
-        self._acquire_resources()
-        self.interrupt_event.clear()
-        return
-
-
-    # Private Methods
-    def _check_resources(self) -> bool:
-        return any([component.locked() for component in self.components])
-
-    def _acquire_resources(self) -> None:
-        for component in self.components:
-            component.acquire()
-
-    def _release_resources(self):
-        for component in self.components:
-            component.release()
-
-            # Notify in case some Teleop commands were suspended.
-            component.notify()
-    
-    def _set_interrupt(self, event) -> None:
-        """Assign global interrupt from CommandGroup to Command"""
-        self.interrupt_event = event
-    
-    def _terminate(self):
-        self.task.cancel()
-
-    
+        self.priority = priority
+
+        self._is_finished = False
+        self._interupted = False
+        self._scheduled = False
+
+
+    # Scheduler Hooks
+    def _initialize(self) -> None:
+        self._is_finished = False
+        self._interupted = False
+
+        profile = self._profile
+        if profile is None:
+            profile = self._profile = CommandProfiler.getInstance().profile(self)
+
+        start = perf_counter()
+        self.initialize()
+        profile.initialize.add(perf_counter() - start)
+
+    def _tick(self) -> bool:
+        """Step the command once. Returns False once the command has ended."""
+        profile = self._profile
+        start = perf_counter()
+        done = self._interupted or self.isFinished()
+        checked = perf_counter()
+        profile.is_finished.add(checked - start)
+
+        if done:
+            self._end()
+            self.last_tick = perf_counter() - start
+            return False
+
+        self.execute()
+        end = perf_counter()
+        profile.execute.add(end - checked)
+        self.last_tick = end - start
+        return True
+
+    def _end(self) -> None:
+        if self._interupted:
+            self.interrupted()
+        self.end()
+
+
     # Public Methods
-    def cancel(self):
+    def cancel(self) -> None:
         """Called by other Commands or CommandGroups"""
-        self.interrupt_event.set()
-    
-    def requires(self, component):
+        self._interupted = True
+
+    def interrupt(self, data=None) -> None:
+        """Same as cancel(); takes the event data so it can be used as a listener."""
+        self.cancel()
+
+    def finished(self) -> None:
+        """Mark the command as done; it is ended on the next scheduler pass."""
+        self._is_finished = True
+
+    def is_running(self) -> bool:
+        return self._scheduled
+
+    def reset(self) -> None:
+        """Make a command that has ended ready to be started again."""
+        self._is_finished = False
+        self._interupted = False
+        self.on_reset()
+
+    def requires(self, component) -> None:
         """Specifies what subsystems will be used in the command."""
-        self.components.append(component._get_lock())
-    
+        self.components.append(component)
+        self.requirements |= Subsystem.mask_of(component)
+
     def start(self) -> None:
-        if self.interrupt_event is None:
-            self.interrupt_event = asyncio.Event()
-        
-        self.task = asyncio.ensure_future(self._run)
-        
-        try:
-            asyncio.get_event_loop().run_until_complete(self.task)
-        except asyncio.CancelledError:
-            print("INFO: Command "+ self.__class__.__name__ +" interrupted.")
-    
-    def _end(self):
-        self.end()
-        self._release_resources()
+        from Scheduler import Scheduler
+        Scheduler.getInstance().add(self)
 
-    def _execute(self):
-        # Keep a constant interval.
-        start_time = datetime.now()
-        self.execute()
-        self.elapsed_time = min(Command.DEFAULT_PERIOD, (datetime.now() - start).seconds)
-    
-    def _initialize(self):
-        if self._check_resources():
-            print('Subsystem in use by another command')
-        else:
-            self._acquire_resources()
-            self.initialize()
-            
 
     # User-Defined Methods
     def end(self) -> None:
-        print("Default end() function - Overload me!")
+        self.on_end()
 
     def execute(self) -> None:
-        print("Default execute() function - Overload me!")
+        pass
 
     def initialize(self) -> None:
-        print("Default initialize() function - Overload me!")
-    
+        self.on_start()
+
     def interrupted(self) -> None:
-        print("Default interrupted() function - Overload me!")
+        self.on_interrupted()
 
     def isFinished(self) -> bool:
-        print("Default isFinished() function - Overload me!")
\ No newline at end of file
+        return self._is_finished
+
+    def on_end(self) -> None:
+        pass
+
+    def on_interrupted(self) -> None:
+        pass
+
+    def on_reset(self) -> None:
+        pass
+
+    def on_start(self) -> None:
+        pass
+
+
+class InstantCommand(Command):
+    def __init__(self, method: Callable):
+        Command.__init__(self)
+        self._instant_method = method
+
+    def initialize(self):
+        self._instant_method()
+        self.finished()
+
+    def end(self):
+        pass
+
+    def execute(self):
+        pass
@@ -1,40 +1,75 @@
-import asyncio
 from Command import Command
 from typing import List
 
 class CommandGroup(Command):
+    """Runs stages of commands one after another.
+
+    Each stage is a list of commands stepped in parallel on the same tick;
+    the group moves to the next stage once every command in it has ended.
+    Commands count as running while their stage runs, so they cannot be
+    started elsewhere or handed out by the CommandPool meanwhile.
+    """
     _command_list: List[List[Command]]
 
     def __init__(self):
-        self.interrupt_event = asyncio.Event()
+        super().__init__()
         self._command_list = []
-        self.task = None
+        self._stage = 0
+        self._running = []
 
-    def add_parallel(self, commands: List[Command]) -> CommandGroup
+    def add_parallel(self, commands: List[Command]) -> "CommandGroup":
         """Takes in a list of commands."""
-        # Assign global interrupt to each command.
         for command in commands:
-            command._set_interrupt(self.interrupt_event)
+            self._add_requirements(command)
 
         self._command_list.append(commands)
         return self
 
-    def add_sequential(self, command: Command) -> CommandGroup:
+    def add_sequential(self, command: Command) -> "CommandGroup":
         """Takes in a single command."""
-        command._set_interrupt(self.interrupt_event)
+        self._add_requirements(command)
 
         self._command_list.append([command])
         return self
 
-    async def _run(self):
-        for commands in self._command_list:
-            try:
-                await asyncio.wait([command._run() for command in commands])
-            except asyncio.CancelledError:
-                break
-        
-        return
-
-    def start(self) -> None:
-        self.task = asyncio.ensure_future(self._run)
-        asyncio.get_event_loop().run_until_complete(self.task)
\ No newline at end of file
+    def _add_requirements(self, command: Command) -> None:
+        for component in command.components:
+            if component not in self.components:
+                self.requires(component)
+
+    def _start_stage(self, stage: int) -> None:
+        self._stage = stage
+        if stage < len(self._command_list):
+            self._running = list(self._command_list[stage])
+            for command in self._running:
+                command._scheduled = True
+                command._initialize()
+        else:
+            self._running = []
+
+    def initialize(self) -> None:
+        self._start_stage(0)
+
+    def execute(self) -> None:
+        running = []
+        for command in self._running:
+            if command._tick():
+                running.append(command)
+            else:
+                command._scheduled = False
+        self._running = running
+        if not running:
+            self._start_stage(self._stage + 1)
+
+    def isFinished(self) -> bool:
+        return self._stage >= len(self._command_list)
+
+    def interrupted(self) -> None:
+        for command in self._running:
+            command.cancel()
+            command._end()
+            command._scheduled = False
+        self._running = []
+
+    def end(self) -> None:
+        pass
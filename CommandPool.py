@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, List
+
+from Command import Command
+
+__all__ = ["AllocationCount", "CommandPool", "count_allocations", "pooled"]
+
+class CommandPool():
+    """Command instances reused across presses instead of rebuilt each time.
+
+    get(factory, *args) hands out an idle instance made by factory with the
+    same arguments, reset() and ready to start, and only calls factory when
+    every such instance is still running. Factories with continuous
+    arguments are capped at MAX_KEYS argument sets each, least recently
+    used first out.
+    """
+    MAX_KEYS = 32
+
+    _instance = None
+
+    _pools: Dict[Callable, "OrderedDict[tuple, List[Command]]"]
+
+    def __init__(self):
+        self._pools = {}
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def getInstance() -> "CommandPool":
+        if CommandPool._instance is None:
+            CommandPool._instance = CommandPool()
+        return CommandPool._instance
+
+    def get(self, factory: Callable[..., Command], *args, **kwargs) -> Command:
+        pool = self._pools.get(factory)
+        if pool is None:
+            pool = self._pools[factory] = OrderedDict()
+
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        instances = pool.get(key)
+        if instances is None:
+            instances = pool[key] = []
+            if len(pool) > CommandPool.MAX_KEYS:
+                pool.popitem(last=False)
+        else:
+            pool.move_to_end(key)
+            for command in instances:
+                if not command._scheduled:
+                    command.reset()
+                    self.reused += 1
+                    return command
+
+        command = factory(*args, **kwargs)
+        instances.append(command)
+        self.created += 1
+        return command
+
+    def clear(self) -> None:
+        self._pools = {}
+
+
+def pooled(factory: Callable[..., Command]) -> Callable[..., Command]:
+    """Make a command factory return pooled instances; arguments must be hashable.
+
+    Pooled instances are shared, so they suit one-shot teleop use. Plans and
+    groups that hold on to their commands call the unpooled factory.build().
+    """
+    @wraps(factory)
+    def get(*args, **kwargs) -> Command:
+        return CommandPool.getInstance().get(factory, *args, **kwargs)
+    get.build = factory
+    return get
+
+
+class AllocationCount():
+    """Commands built while a count_allocations() block ran."""
+
+    def __init__(self):
+        self._start = Command.created
+        self._end = None
+
+    @property
+    def count(self) -> int:
+        end = Command.created if self._end is None else self._end
+        return end - self._start
+
+    def __enter__(self) -> "AllocationCount":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._end = Command.created
+
+
+def count_allocations() -> AllocationCount:
+    """with count_allocations() as allocations: ...; allocations.count"""
+    return AllocationCount()
@@ -0,0 +1,130 @@
+import json
+import time
+from bisect import bisect_right
+
+from DashboardPublisher import DashboardPublisher
+
+__all__ = ["CommandProfiler", "Histogram"]
+
+class Histogram():
+    """Fixed-bucket histogram of durations in seconds."""
+    # Upper bucket edges; the last bucket holds everything slower than 20 ms.
+    EDGES = (
+        0.00001, 0.00002, 0.00005,
+        0.0001, 0.0002, 0.0005,
+        0.001, 0.002, 0.005,
+        0.01, 0.02
+    )
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(Histogram.EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect_right(Histogram.EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bucket holding percentile p (0-100), capped at max."""
+        if self.count == 0:
+            return 0.0
+        target = p / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(Histogram.EDGES[index], self.max) if index < len(Histogram.EDGES) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "counts": self.counts,
+            "count": self.count,
+            "total": self.total,
+            "max": self.max
+        }
+
+
+class CommandProfile():
+    """Histograms of one Command class's initialize/execute/isFinished calls."""
+    __slots__ = ("name", "initialize", "execute", "is_finished")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.initialize = Histogram()
+        self.execute = Histogram()
+        self.is_finished = Histogram()
+
+    def phases(self) -> tuple:
+        return (
+            ("initialize", self.initialize),
+            ("execute", self.execute),
+            ("isFinished", self.is_finished)
+        )
+
+
+class CommandProfiler():
+    """Always-on timing of every Command, keyed by Command class.
+
+    Commands record into their class's CommandProfile from the scheduler
+    hooks. periodic() hands p50/p99/max per phase to the DashboardPublisher
+    at most once every PUBLISH_PERIOD, and dump() writes the full histograms
+    out.
+    """
+    PUBLISH_PERIOD = 1.0
+    DUMP_PATH = "command_profile.json"
+
+    _instance = None
+
+    def __init__(self):
+        self._profiles = {}
+        self._next_publish = 0.0
+
+    @staticmethod
+    def getInstance() -> "CommandProfiler":
+        if CommandProfiler._instance is None:
+            CommandProfiler._instance = CommandProfiler()
+        return CommandProfiler._instance
+
+    def profile(self, command) -> CommandProfile:
+        name = type(command).__name__
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = self._profiles[name] = CommandProfile(name)
+        return profile
+
+    def periodic(self) -> None:
+        now = time.monotonic()
+        if now < self._next_publish:
+            return
+        self._next_publish = now + CommandProfiler.PUBLISH_PERIOD
+        self.publish()
+
+    def publish(self) -> None:
+        dashboard = DashboardPublisher.getInstance()
+        for profile in self._profiles.values():
+            for phase, histogram in profile.phases():
+                if histogram.count == 0:
+                    continue
+                key = "profile/" + profile.name + "/" + phase
+                dashboard.put(key + "_p50_ms", histogram.percentile(50) * 1000)
+                dashboard.put(key + "_p99_ms", histogram.percentile(99) * 1000)
+                dashboard.put(key + "_max_ms", histogram.max * 1000)
+
+    def dump(self, path: str = None) -> None:
+        """Write every histogram to a JSON file."""
+        report = {
+            "edges": Histogram.EDGES,
+            "commands": {
+                profile.name: {phase: histogram.to_dict() for phase, histogram in profile.phases()}
+                for profile in self._profiles.values()
+            }
+        }
+        with open(path or CommandProfiler.DUMP_PATH, "w") as f:
+            json.dump(report, f)
@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from time import perf_counter
+from typing import Callable, Optional, Tuple
+
+from CommandProfiler import Histogram
+
+__all__ = ["ControlExecutor", "ControlLoop"]
+
+logger = logging.getLogger("robot.control")
+
+
+class ControlLoop():
+    """A PID loop stepped by the ControlExecutor instead of its own notifier.
+
+    Gains are given per 50 ms period, like wpilib's PIDController, and are
+    scaled to the executor's rate so loops keep their tuning at any rate.
+    The executor writes output and error; the main loop only reads them, so
+    no lock is needed to hand a result over.
+    """
+    # wpilib.PIDController's default period, which the gains are tuned for
+    BASE_PERIOD = 0.05
+
+    __slots__ = ("name", "source", "kP", "kI", "kD", "kF", "minimum_output", "maximum_output",
+                 "tolerance", "setpoint", "output", "error", "timing", "_total_error", "_previous_error")
+
+    def __init__(self, name: str, source: Callable[[], float], kP: float, kI: float, kD: float, kF: float = 0.0,
+                 output_range: Tuple[float, float] = (-1.0, 1.0), tolerance: float = 0.0):
+        self.name = name
+        self.source = source
+        self.kP = kP
+        self.kI = kI
+        self.kD = kD
+        self.kF = kF
+        self.minimum_output, self.maximum_output = output_range
+        self.tolerance = tolerance
+
+        self.setpoint = 0.0
+        self.output = 0.0
+        self.error = None
+        self.timing = Histogram()
+
+        self._total_error = 0.0
+        self._previous_error = 0.0
+
+    def reset(self) -> None:
+        self.output = 0.0
+        self.error = None
+        self._total_error = 0.0
+        self._previous_error = 0.0
+
+    def on_target(self) -> bool:
+        """True once the last error was within tolerance."""
+        error = self.error
+        return error is not None and abs(error) <= self.tolerance
+
+    def update(self, value: float, dt: float) -> float:
+        error = self.setpoint - value
+        scale = dt / ControlLoop.BASE_PERIOD
+        if self.error is None:
+            self._previous_error = error
+
+        if self.kI > 0:
+            # keep the integral from winding up past what the output can use
+            total = self._total_error + error * scale
+            self._total_error = min(max(total, self.minimum_output / self.kI), self.maximum_output / self.kI)
+        output = self.kP * error \
+            + self.kI * self._total_error \
+            + self.kD * (error - self._previous_error) / scale \
+            + self.kF * self.setpoint
+
+        self._previous_error = error
+        self.error = error
+        self.output = min(max(output, self.minimum_output), self.maximum_output)
+        return self.output
+
+
+class ControlExecutor():
+    """Runs every active ControlLoop at PERIOD on one shared thread.
+
+    Commands add() a loop when they start and remove() it when they end, so
+    only running loops cost anything and the thread count stays at one no
+    matter how many commands are built. Each pass reads every distinct
+    sensor source once, then updates the loops from those readings. The set
+    of loops is an immutable tuple replaced on add()/remove(), so the
+    executor thread never takes a lock while running.
+    """
+    PERIOD = 0.005
+
+    _instance = None
+
+    _loops: Tuple[ControlLoop, ...]
+
+    def __init__(self, period: float = None):
+        self.period = period or ControlExecutor.PERIOD
+        self.passes = 0
+        self.overruns = 0
+        self.read_timing = Histogram()
+        self.pass_timing = Histogram()
+
+        self._loops = ()
+        self._thread = None  # type: Optional[threading.Thread]
+        self._running = False
+        self._wake = threading.Event()
+
+    @staticmethod
+    def getInstance() -> "ControlExecutor":
+        if ControlExecutor._instance is None:
+            ControlExecutor._instance = ControlExecutor()
+        return ControlExecutor._instance
+
+    @property
+    def loops(self) -> Tuple[ControlLoop, ...]:
+        return self._loops
+
+    def add(self, loop: ControlLoop) -> ControlLoop:
+        if loop not in self._loops:
+            loop.reset()
+            self._loops = self._loops + (loop,)
+            self._wake.set()
+        return loop
+
+    def remove(self, loop: ControlLoop) -> None:
+        if loop in self._loops:
+            self._loops = tuple(other for other in self._loops if other is not loop)
+        loop.output = 0.0
+
+    def start(self, period: float = None) -> None:
+        """Start the executor thread; loops are only stepped by step() until then."""
+        if self._thread is not None:
+            return
+        if period is not None:
+            self.period = period
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ControlExecutor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def step(self, dt: float = None) -> None:
+        """Run one pass over the active loops."""
+        loops = self._loops
+        if not loops:
+            return
+        dt = dt or self.period
+        start = perf_counter()
+
+        readings = {}
+        for loop in loops:
+            if loop.source not in readings:
+                readings[loop.source] = loop.source()
+        read_done = perf_counter()
+        self.read_timing.add(read_done - start)
+
+        for loop in loops:
+            loop_start = perf_counter()
+            loop.update(readings[loop.source], dt)
+            loop.timing.add(perf_counter() - loop_start)
+
+        self.passes += 1
+        self.pass_timing.add(perf_counter() - start)
+
+    def _run(self) -> None:
+        period = self.period
+        deadline = time.monotonic()
+        while self._running:
+            if not self._loops:
+                # nothing to run, sleep until a loop is added
+                self._wake.wait()
+                self._wake.clear()
+                deadline = time.monotonic()
+                continue
+
+            try:
+                self.step(period)
+            except Exception:
+                logger.exception("control loop failed")
+
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self.overruns += 1
+                deadline = time.monotonic()
+
+    def stats(self) -> dict:
+        """p50/p99/max update time of each active loop and of whole passes, in seconds."""
+        def summary(histogram: Histogram) -> dict:
+            return {
+                "count": histogram.count,
+                "p50": histogram.percentile(50),
+                "p99": histogram.percentile(99),
+                "max": histogram.max
+            }
+
+        return {
+            "passes": self.passes,
+            "overruns": self.overruns,
+            "read": summary(self.read_timing),
+            "pass": summary(self.pass_timing),
+            "loops": {loop.name: summary(loop.timing) for loop in self._loops}
+        }
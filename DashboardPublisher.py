@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+__all__ = ["DashboardPublisher"]
+
+logger = logging.getLogger("robot.dashboard")
+
+
+class _Channel():
+    __slots__ = ("key", "read", "period", "epsilon", "due", "sent")
+
+    def __init__(self, key: str, read: Callable, period: float, epsilon: float):
+        self.key = key
+        self.read = read
+        self.period = period
+        self.epsilon = epsilon
+        self.due = 0.0
+        self.sent = None
+
+
+class DashboardPublisher():
+    """Everything the robot puts on SmartDashboard, sent in batches off the robot loop.
+
+    Components add() a key with a read function, a refresh period and an
+    epsilon. A background thread reads each key when its period is up and
+    only puts values that moved by more than epsilon (or changed, for
+    strings and booleans); one NetworkTables.flush() then sends the batch.
+    put() queues a one-off value for the next batch. read functions run on
+    the publisher thread, so they should return cached values rather than
+    touch hardware.
+
+    The bytes sent are estimated from the NetworkTables entry update size,
+    and kept per second in bandwidth; it is published under
+    dashboard/kbps and a warning is logged over BANDWIDTH_BUDGET.
+
+    wpilib and networktables are only imported once something is published,
+    so code that merely registers values, like the headless benchmarks,
+    runs without them.
+    """
+    PERIOD = 0.05
+    DEFAULT_RATE = 0.1
+    # bits per second; a small share of the field's 4 Mbit/s cap
+    BANDWIDTH_BUDGET = 100000
+    # NetworkTables 3 entry update: message type, id, sequence number, value type
+    UPDATE_OVERHEAD = 6
+
+    _instance = None
+
+    _channels: List[_Channel]
+    _queued: Dict[str, Any]
+
+    def __init__(self):
+        self._channels = []
+        self._queued = {}
+        self._queue_lock = threading.Lock()
+        self._sent = {}
+        self._thread = None
+        self._running = False
+
+        self.bandwidth = 0.0
+        self.updates = 0
+        self.skipped = 0
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+
+    @staticmethod
+    def getInstance() -> "DashboardPublisher":
+        if DashboardPublisher._instance is None:
+            DashboardPublisher._instance = DashboardPublisher()
+        return DashboardPublisher._instance
+
+    def add(self, key: str, read: Callable, period: float = None, epsilon: float = 0.0) -> None:
+        """Publish read() under key at most once every period seconds."""
+        channels = list(self._channels)
+        channels.append(_Channel(key, read, period or DashboardPublisher.DEFAULT_RATE, epsilon))
+        # replaced, not appended to, so the publisher thread never sees a list being changed
+        self._channels = channels
+
+    def put(self, key: str, value) -> None:
+        """Send value with the next batch; only the latest value per key is sent."""
+        with self._queue_lock:
+            self._queued[key] = value
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="DashboardPublisher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def publish(self) -> int:
+        """Send every due, changed value and flush. Returns how many were sent."""
+        from networktables import NetworkTables
+        from wpilib import SmartDashboard
+
+        now = time.monotonic()
+        sent = 0
+        for channel in self._channels:
+            if now < channel.due:
+                continue
+            channel.due = now + channel.period
+            try:
+                value = channel.read()
+            except Exception:
+                logger.exception("could not read %s", channel.key)
+                continue
+            if self._changed(channel.sent, value, channel.epsilon):
+                channel.sent = value
+                self._send(SmartDashboard, channel.key, value)
+                sent += 1
+            else:
+                self.skipped += 1
+
+        if self._queued:
+            with self._queue_lock:
+                queued, self._queued = self._queued, {}
+            for key, value in queued.items():
+                if self._changed(self._sent.get(key), value, 0.0):
+                    self._sent[key] = value
+                    self._send(SmartDashboard, key, value)
+                    sent += 1
+                else:
+                    self.skipped += 1
+
+        if sent:
+            NetworkTables.flush()
+        self.updates += sent
+        self._measure(now)
+        return sent
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            "updates": self.updates,
+            "skipped": self.skipped,
+            "bandwidth_bps": self.bandwidth
+        }
+
+    # Private Methods
+    @staticmethod
+    def _changed(previous, value, epsilon: float) -> bool:
+        if previous is None or type(previous) is not type(value):
+            return True
+        if isinstance(value, float):
+            return abs(value - previous) > epsilon
+        return value != previous
+
+    def _send(self, dashboard, key: str, value) -> None:
+        if isinstance(value, bool):
+            dashboard.putBoolean(key, value)
+            size = 1
+        elif isinstance(value, (int, float)):
+            dashboard.putNumber(key, value)
+            size = 8
+        else:
+            value = str(value)
+            dashboard.putString(key, value)
+            size = 2 + len(value)
+        self._window_bytes += DashboardPublisher.UPDATE_OVERHEAD + len(key) + size
+
+    def _measure(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed < 1.0:
+            return
+        self.bandwidth = self._window_bytes * 8 / elapsed
+        self._window_bytes = 0
+        self._window_start = now
+        self.put("dashboard/kbps", round(self.bandwidth / 1000, 1))
+        if self.bandwidth > DashboardPublisher.BANDWIDTH_BUDGET:
+            logger.warning("dashboard using %.0f kbit/s, budget %.0f",
+                           self.bandwidth / 1000, DashboardPublisher.BANDWIDTH_BUDGET / 1000)
+
+    def _run(self) -> None:
+        period = DashboardPublisher.PERIOD
+        while self._running:
+            start = time.monotonic()
+            try:
+                self.publish()
+            except Exception:
+                logger.exception("dashboard publish failed")
+            delay = period - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
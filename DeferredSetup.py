@@ -0,0 +1,93 @@
+import logging
+import threading
+from typing import Callable, List
+
+from BootProfiler import BootProfiler
+
+__all__ = ["DeferredSetup"]
+
+logger = logging.getLogger("robot.boot")
+
+
+class _Task():
+    __slots__ = ("name", "run", "started", "done")
+
+    def __init__(self, name: str, run: Callable):
+        self.name = name
+        self.run = run
+        self.started = False
+        self.done = threading.Event()
+
+
+class DeferredSetup():
+    """Setup work that can wait until after the robot has reported ready.
+
+    Components defer() anything the robot can drive without, such as
+    configuration the motor controllers keep in flash anyway. AsyncRobot
+    either runs it all before reporting ready or, with FAST_BOOT, start()s
+    a background thread that works through it afterwards. Code that needs
+    a task's result calls ensure(name), which runs the task right away if
+    the thread has not got to it yet, or waits for it to finish.
+    """
+    _instance = None
+
+    _tasks: List[_Task]
+
+    def __init__(self):
+        self._tasks = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @staticmethod
+    def getInstance() -> "DeferredSetup":
+        if DeferredSetup._instance is None:
+            DeferredSetup._instance = DeferredSetup()
+        return DeferredSetup._instance
+
+    @property
+    def pending(self) -> int:
+        return len([task for task in self._tasks if not task.started])
+
+    def defer(self, name: str, run: Callable) -> None:
+        with self._lock:
+            self._tasks.append(_Task(name, run))
+
+    def run_all(self) -> None:
+        while self._run_next():
+            pass
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_all, name="DeferredSetup", daemon=True)
+            self._thread.start()
+
+    def ensure(self, name: str) -> None:
+        """Make sure the task called name has run."""
+        with self._lock:
+            task = next((task for task in self._tasks if task.name == name), None)
+            if task is None:
+                return
+            run_here = not task.started
+            task.started = True
+        if run_here:
+            self._run(task)
+        else:
+            task.done.wait()
+
+    def _run_next(self) -> bool:
+        with self._lock:
+            task = next((task for task in self._tasks if not task.started), None)
+            if task is None:
+                return False
+            task.started = True
+        self._run(task)
+        return True
+
+    def _run(self, task: _Task) -> None:
+        try:
+            with BootProfiler.getInstance().timing("deferred", task.name):
+                task.run()
+        except Exception:
+            logger.exception("deferred setup %s failed", task.name)
+        finally:
+            task.done.set()
@@ -0,0 +1,90 @@
+import weakref
+from typing import Callable, List
+
+__all__ = ["Events"]
+
+class _StrongRef():
+    """Same interface as weakref.ref, for listeners that are kept alive."""
+    __slots__ = ("listener",)
+
+    def __init__(self, listener: Callable):
+        self.listener = listener
+
+    def __call__(self) -> Callable:
+        return self.listener
+
+
+def _ref(listener: Callable):
+    # Bound methods are held weakly so a finished command does not stay
+    # alive just because it never removed its listener.
+    if hasattr(listener, "__self__") and hasattr(listener, "__func__"):
+        return weakref.WeakMethod(listener)
+    return _StrongRef(listener)
+
+
+class Events():
+    """Named events a component can trigger and other code can listen to.
+
+    Each event keeps its listeners as a tuple that is only rebuilt when a
+    listener is added or removed, so trigger_event() is a plain loop.
+    Listeners are called with the event's data. Bound methods are held by
+    weak reference and dropped once their object is gone.
+
+    Events created with coalesce=True are not delivered straight away: all
+    triggers within a tick collapse into one delivery, with the last data,
+    when AsyncRobot calls Events.flush().
+    """
+    _pending: List[tuple] = []
+
+    def __init__(self):
+        self._listeners = {}
+        self._coalesced = set()
+        self._pending_data = {}
+
+    def _create_event(self, name: str, coalesce: bool = False) -> None:
+        self._listeners[name] = ()
+        if coalesce:
+            self._coalesced.add(name)
+
+    def _create_events(self, names: List[str], coalesce: bool = False) -> None:
+        for name in names:
+            self._create_event(name, coalesce)
+
+    def add_listener(self, name: str, listener: Callable) -> None:
+        self._listeners[name] = self._listeners[name] + (_ref(listener),)
+
+    def remove_listener(self, name: str, listener: Callable) -> None:
+        self._listeners[name] = tuple([
+            ref for ref in self._listeners[name]
+            if ref() is not None and ref() != listener
+        ])
+
+    def trigger_event(self, name: str, data=None) -> None:
+        if name in self._coalesced:
+            if name not in self._pending_data:
+                Events._pending.append((self, name))
+            self._pending_data[name] = data
+            return
+        self._deliver(name, data)
+
+    def _deliver(self, name: str, data) -> None:
+        dead = False
+        for ref in self._listeners[name]:
+            listener = ref()
+            if listener is None:
+                dead = True
+            else:
+                listener(data)
+
+        if dead:
+            self._listeners[name] = tuple([ref for ref in self._listeners[name] if ref() is not None])
+
+    @staticmethod
+    def flush() -> None:
+        """Deliver every coalesced event triggered since the last flush."""
+        if not Events._pending:
+            return
+        pending = Events._pending
+        Events._pending = []
+        for events, name in pending:
+            events._deliver(name, events._pending_data.pop(name))
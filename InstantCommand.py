@@ -1,14 +1,3 @@
-class InstantCommand(Command):
-    def __init__(self, method: Callable):
-        Command.__init__(self)
-        self._instant_method = method
+from Command import InstantCommand
 
-    def initialize(self):
-        self._instant_method()
-        self.finished()
-
-    def end(self):
-        pass
-
-    def execute(self):
-        pass
\ No newline at end of file
+__all__ = ["InstantCommand"]
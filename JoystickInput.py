@@ -0,0 +1,105 @@
+from enum import Enum, auto
+from typing import Callable, Dict, List, Union
+
+from wpilib import DriverStation
+from Command import Command
+from Scheduler import Scheduler
+from SensorSnapshot import SensorSnapshot
+
+__all__ = ["JoystickInput", "When"]
+
+class When(Enum):
+    PRESSED = auto()
+    RELEASED = auto()
+    # every tick the button is down
+    HELD = auto()
+
+
+# A Command to start, or a factory returning one (InstantCommand factories, pooled classes).
+Target = Union[Command, Callable[[], Command]]
+
+
+class JoystickInput():
+    """One joystick, read once per tick: every axis, the button bitmask and the POV.
+
+    sample() is registered with the SensorSnapshot, so it runs at the top
+    of every tick. Buttons are a bitmask, bit n - 1 for button n, and
+    pressed/released are the edges since the last tick, worked out with two
+    bit operations. dispatch() starts the commands bound to buttons that
+    changed; it only visits the set bits of pressed, released and the held
+    bindings, so a binding costs nothing while its button is up.
+    """
+
+    def __init__(self, port: int, axis_count: int = 6):
+        self.port = port
+        self.axes = [0.0] * axis_count
+        self.buttons = 0
+        self.pressed = 0
+        self.released = 0
+        self.pov = -1
+
+        self._ds = DriverStation.getInstance()
+        # When -> {button bit: targets}
+        self._bindings = {when: {} for when in When}  # type: Dict[When, Dict[int, List[Target]]]
+        self._held_mask = 0
+        SensorSnapshot.getInstance().add(self.sample)
+
+    def sample(self) -> None:
+        ds = self._ds
+        port = self.port
+        previous = self.buttons
+        buttons = self.buttons = ds.getStickButtons(port)
+        self.pressed = buttons & ~previous
+        self.released = previous & ~buttons
+
+        axes = self.axes
+        for index in range(len(axes)):
+            axes[index] = ds.getStickAxis(port, index)
+        self.pov = ds.getStickPOV(port, 0)
+
+    def axis(self, axis: int) -> float:
+        return self.axes[axis]
+
+    def held(self, button: int) -> bool:
+        return bool(self.buttons >> (button - 1) & 1)
+
+    def was_pressed(self, button: int) -> bool:
+        return bool(self.pressed >> (button - 1) & 1)
+
+    def was_released(self, button: int) -> bool:
+        return bool(self.released >> (button - 1) & 1)
+
+    def bind(self, button: int, target: Target, when: When = When.PRESSED) -> None:
+        bit = 1 << (button - 1)
+        self._bindings[when].setdefault(bit, []).append(target)
+        if when is When.HELD:
+            self._held_mask |= bit
+
+    def bind_all(self, table: dict) -> None:
+        """Bind {button: target} or {button: (target, When)}."""
+        for button, binding in table.items():
+            if isinstance(binding, tuple):
+                self.bind(button, *binding)
+            else:
+                self.bind(button, binding)
+
+    def dispatch(self) -> None:
+        if self.pressed:
+            self._start(self._bindings[When.PRESSED], self.pressed)
+        if self.released:
+            self._start(self._bindings[When.RELEASED], self.released)
+        held = self.buttons & self._held_mask
+        if held:
+            self._start(self._bindings[When.HELD], held)
+
+    @staticmethod
+    def _start(bindings: Dict[int, List[Target]], mask: int) -> None:
+        scheduler = Scheduler.getInstance()
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            targets = bindings.get(bit)
+            if targets is None:
+                continue
+            for target in targets:
+                scheduler.add(target if isinstance(target, Command) else target())
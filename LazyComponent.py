@@ -0,0 +1,41 @@
+import importlib
+import threading
+
+from BootProfiler import BootProfiler
+
+__all__ = ["LazyComponent"]
+
+class LazyComponent():
+    """A RobotMap class attribute that imports and builds its component on first use.
+
+    target is "module:Class"; nothing is imported until the attribute is
+    read. Construction time is recorded by the BootProfiler. build() may be
+    called from the DeferredSetup thread; the component is only built once.
+    """
+
+    def __init__(self, target: str):
+        self.target = target
+        self.name = target
+        self._component = None
+        self._lock = threading.Lock()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        component = self._component
+        if component is None:
+            component = self.build()
+        return component
+
+    @property
+    def built(self) -> bool:
+        return self._component is not None
+
+    def build(self):
+        with self._lock:
+            if self._component is None:
+                module, attribute = self.target.split(":")
+                with BootProfiler.getInstance().timing("component", self.name):
+                    self._component = getattr(importlib.import_module(module), attribute)()
+        return self._component
@@ -0,0 +1,104 @@
+from time import perf_counter
+from typing import Dict, List
+
+__all__ = ["LoopPhases", "PhaseStats"]
+
+
+class PhaseStats():
+    """The last HISTORY_SIZE durations of one loop phase, in seconds."""
+    HISTORY_SIZE = 512
+    __slots__ = ("name", "last", "tick", "_values", "_index", "_count")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.last = 0.0
+        # the LoopPhases tick last recorded
+        self.tick = 0
+        self._values = [0.0] * PhaseStats.HISTORY_SIZE
+        self._index = 0
+        self._count = 0
+
+    def add(self, seconds: float) -> None:
+        self.last = seconds
+        self._values[self._index] = seconds
+        self._index = (self._index + 1) % PhaseStats.HISTORY_SIZE
+        self._count += 1
+
+    def window(self) -> List[float]:
+        return self._values[:min(self._count, PhaseStats.HISTORY_SIZE)]
+
+    def percentile(self, p: float) -> float:
+        values = sorted(self.window())
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(p / 100.0 * len(values)))]
+
+    def to_dict(self) -> dict:
+        values = sorted(self.window())
+        if not values:
+            return {"min": 0.0, "avg": 0.0, "max": 0.0, "p99": 0.0}
+        return {
+            "min": values[0],
+            "avg": sum(values) / len(values),
+            "max": values[-1],
+            "p99": values[min(len(values) - 1, int(0.99 * len(values)))]
+        }
+
+
+class LoopPhases():
+    """Per-phase timing of every robot loop, on the monotonic perf_counter.
+
+    begin() starts a tick and each lap(name) closes the phase that ran
+    since the previous lap, so a tick costs one perf_counter() call and one
+    list store per phase. Durations are kept in a fixed window per phase;
+    min/avg/max/p99 are only worked out when asked for. Phases named up
+    front keep that order; others are added the first time they run.
+    """
+
+    _phases: Dict[str, PhaseStats]
+
+    def __init__(self, names: tuple = ()):
+        self._phases = {}
+        self._order = []
+        self._last = 0.0
+        self.tick_start = 0.0
+        self.ticks = 0
+        for name in names:
+            self._add(name)
+
+    def begin(self) -> None:
+        self.ticks += 1
+        self.tick_start = self._last = perf_counter()
+
+    def lap(self, name: str) -> None:
+        now = perf_counter()
+        phase = self._phases.get(name) or self._add(name)
+        phase.add(now - self._last)
+        phase.tick = self.ticks
+        self._last = now
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds from begin() to the last lap."""
+        return self._last - self.tick_start
+
+    @property
+    def phases(self) -> List[PhaseStats]:
+        """Every phase seen so far, in the order they first ran."""
+        return self._order
+
+    def last_tick(self) -> List[PhaseStats]:
+        """The phases that ran in the current tick."""
+        return [phase for phase in self._order if phase.tick == self.ticks]
+
+    def slowest(self) -> PhaseStats:
+        """The phase that took longest in the current tick."""
+        return max(self.last_tick(), key=lambda phase: phase.last)
+
+    def stats(self) -> dict:
+        return {phase.name: phase.to_dict() for phase in self._order}
+
+    def _add(self, name: str) -> PhaseStats:
+        phase = self._phases[name] = PhaseStats(name)
+        self._order.append(phase)
+        return phase
@@ -0,0 +1,102 @@
+from enum import Enum, auto
+from Clock import Clock
+
+__all__ = ["LoopTimer", "OverrunPolicy"]
+
+class OverrunPolicy(Enum):
+    # Drop the ticks that were missed and stay on the original 20 ms grid.
+    SKIP = auto()
+    # Run the missed ticks back to back until the loop is on time again.
+    CATCH_UP = auto()
+    # Start a new grid from the end of the late tick.
+    STRETCH = auto()
+
+
+class LoopTimer():
+    """Absolute deadlines for a fixed-rate loop, read from the installed Clock.
+
+    begin() is called at the top of every tick and end() after the work is
+    done; end() returns how long to sleep until the next deadline. Deadlines
+    are kept on a fixed grid so the loop does not drift, and overruns are
+    handled according to the OverrunPolicy.
+    """
+    HISTORY_SIZE = 512
+
+    def __init__(self, period: float, policy: OverrunPolicy = OverrunPolicy.SKIP, clock: Clock = None):
+        self.period = period
+        self.policy = policy
+        self.clock = clock or Clock.getInstance()
+
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.worst_jitter = 0.0
+
+        self._deadline = None
+        self._last_start = None
+        self._periods = [0.0] * LoopTimer.HISTORY_SIZE
+        self._index = 0
+        self._count = 0
+
+    def begin(self) -> float:
+        """Mark the start of a tick. Returns the current clock time."""
+        now = self.clock.now()
+        if self._last_start is None:
+            self._deadline = now
+        else:
+            self._periods[self._index] = now - self._last_start
+            self._index = (self._index + 1) % LoopTimer.HISTORY_SIZE
+            self._count += 1
+
+            jitter = abs(now - self._deadline)
+            if jitter > self.worst_jitter:
+                self.worst_jitter = jitter
+
+        self._last_start = now
+        self.ticks += 1
+        return now
+
+    def end(self) -> float:
+        """Mark the end of a tick. Returns the seconds left until the next deadline."""
+        now = self.clock.now()
+        deadline = self._deadline + self.period
+
+        if now > deadline:
+            self.overruns += 1
+            if self.policy is OverrunPolicy.SKIP:
+                missed = int((now - deadline) / self.period) + 1
+                self.skipped_ticks += missed
+                deadline += missed * self.period
+            elif self.policy is OverrunPolicy.STRETCH:
+                deadline = now
+
+        self._deadline = deadline
+        return max(0.0, deadline - now)
+
+    def percentile(self, p: float) -> float:
+        """Loop period at percentile p (0-100) over the recent history."""
+        count = min(self._count, LoopTimer.HISTORY_SIZE)
+        if count == 0:
+            return 0.0
+        periods = sorted(self._periods[:count])
+        return periods[min(count - 1, int(p / 100.0 * count))]
+
+    @property
+    def last_start(self) -> float:
+        return self._last_start or 0.0
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    def reset_stats(self) -> None:
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.worst_jitter = 0.0
+        self._index = 0
+        self._count = 0
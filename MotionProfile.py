@@ -0,0 +1,98 @@
+from functools import lru_cache
+from math import copysign, sqrt
+
+import numpy as np
+
+__all__ = ["MotionProfile", "s_curve", "trapezoid"]
+
+class MotionProfile():
+    """Position, velocity and acceleration of a move, precomputed every dt seconds.
+
+    Arrays start at 0 and end at the move's distance with zero velocity.
+    Profiles are shared through the memoized trapezoid()/s_curve() so they
+    are read-only.
+    """
+    __slots__ = ("dt", "time", "position", "velocity", "acceleration", "last")
+
+    def __init__(self, dt: float, position: np.ndarray, velocity: np.ndarray, acceleration: np.ndarray):
+        self.dt = dt
+        self.time = np.arange(len(position)) * dt
+        self.position = position
+        self.velocity = velocity
+        self.acceleration = acceleration
+        self.last = len(position) - 1
+
+        for array in (self.time, position, velocity, acceleration):
+            array.flags.writeable = False
+
+    @property
+    def duration(self) -> float:
+        return self.last * self.dt
+
+    @property
+    def distance(self) -> float:
+        return float(self.position[-1])
+
+    def index(self, t: float) -> int:
+        """Index of the sample at time t, held at the last sample once the move is over."""
+        return min(max(int(t / self.dt), 0), self.last)
+
+    def sample(self, t: float) -> tuple:
+        """(position, velocity, acceleration) at time t."""
+        i = self.index(t)
+        return float(self.position[i]), float(self.velocity[i]), float(self.acceleration[i])
+
+    def is_done(self, t: float) -> bool:
+        return t >= self.duration
+
+
+@lru_cache(maxsize=256)
+def trapezoid(distance: float, v_max: float, a_max: float, dt: float = 0.02) -> MotionProfile:
+    """Fastest move over distance with |velocity| <= v_max and |acceleration| <= a_max."""
+    d = abs(distance)
+    sign = copysign(1.0, distance)
+    if d == 0:
+        zero = np.zeros(1)
+        return MotionProfile(dt, zero, zero.copy(), zero.copy())
+
+    # Triangular when there is no room to reach v_max.
+    v_peak = min(v_max, sqrt(d * a_max))
+    t_acc = v_peak / a_max
+    t_cruise = (d - v_peak * t_acc) / v_peak
+    t_total = 2 * t_acc + t_cruise
+
+    t = np.minimum(np.arange(int(np.ceil(t_total / dt)) + 1) * dt, t_total)
+    t_dec = t_acc + t_cruise
+
+    position = np.select(
+        [t < t_acc, t < t_dec],
+        [0.5 * a_max * t ** 2, 0.5 * a_max * t_acc ** 2 + v_peak * (t - t_acc)],
+        d - 0.5 * a_max * (t_total - t) ** 2
+    )
+    velocity = np.clip(np.minimum(a_max * t, a_max * (t_total - t)), 0.0, v_peak)
+    acceleration = np.select([t < t_acc, t < t_dec], [a_max, 0.0], -a_max)
+    acceleration[-1] = 0.0
+
+    return MotionProfile(dt, sign * position, sign * velocity, sign * acceleration)
+
+
+@lru_cache(maxsize=256)
+def s_curve(distance: float, v_max: float, a_max: float, j_max: float, dt: float = 0.02) -> MotionProfile:
+    """Trapezoid smoothed so that |jerk| <= j_max.
+
+    The trapezoid's velocity is convolved with a box a_max / j_max seconds
+    wide, which turns each acceleration step into a ramp and keeps the
+    distance the same; the move gets a_max / j_max seconds longer.
+    """
+    base = trapezoid(distance, v_max, a_max, dt)
+    width = max(1, int(round(a_max / j_max / dt)))
+    if width == 1 or base.last == 0:
+        return base
+
+    velocity = np.convolve(base.velocity, np.ones(width) / width)
+    position = np.concatenate(([0.0], np.cumsum((velocity[1:] + velocity[:-1]) * 0.5 * dt)))
+    if position[-1] != 0:
+        position *= base.distance / position[-1]
+    acceleration = np.gradient(velocity, dt)
+
+    return MotionProfile(dt, position, velocity, acceleration)
@@ -0,0 +1,119 @@
+from typing import List
+from TelemetryRecorder import TelemetryRecorder
+
+__all__ = ["BufferedOutput", "OutputBuffer"]
+
+class BufferedOutput():
+    """Wraps a motor controller or solenoid so set() is sent at most once a tick.
+
+    set() only records the latest value; flush() sends it if it differs from
+    the value last sent to the device. Everything else is passed straight
+    through to the wrapped device.
+    """
+    __slots__ = ("device", "name", "followers", "writes", "suppressed", "coalesced", "_value", "_sent")
+
+    def __init__(self, device, name: str):
+        self.device = device
+        self.name = name
+        self.followers = []
+
+        self.writes = 0
+        self.suppressed = 0
+        self.coalesced = 0
+
+        self._value = None
+        self._sent = None
+
+    def __getattr__(self, name):
+        return getattr(self.device, name)
+
+    def set(self, *value) -> None:
+        if self._value is not None:
+            self.coalesced += 1
+        self._value = value
+
+    @property
+    def sent_value(self) -> float:
+        """The last value sent to the device, or NaN if nothing was sent."""
+        if self._sent is None:
+            return float("nan")
+        return float(self._sent[-1])
+
+    def stopMotor(self) -> None:
+        self._value = None
+        self._sent = None
+        self.device.stopMotor()
+        for follower in self.followers:
+            follower.stopMotor()
+
+    def flush(self) -> None:
+        value = self._value
+        if value is None:
+            return
+        self._value = None
+
+        if value == self._sent:
+            self.suppressed += 1
+            return
+
+        self._sent = value
+        self.writes += 1
+        self.device.set(*value)
+        for follower in self.followers:
+            follower.set(*value)
+
+
+class OutputBuffer():
+    """Every BufferedOutput on the robot, flushed in one batch per tick.
+
+    AsyncRobot calls flush() at the end of each loop, after the commands have
+    run. Followers are paired with a leader through pair(); CAN controllers
+    are put in hardware follower mode so only the leader is ever written,
+    other controllers are written from the leader's flush when it changes.
+    Every output's sent value is recorded by the TelemetryRecorder.
+    """
+    _instance = None
+
+    _outputs: List[BufferedOutput]
+
+    def __init__(self):
+        self._outputs = []
+
+    @staticmethod
+    def getInstance() -> "OutputBuffer":
+        if OutputBuffer._instance is None:
+            OutputBuffer._instance = OutputBuffer()
+        return OutputBuffer._instance
+
+    @property
+    def outputs(self) -> List[BufferedOutput]:
+        return self._outputs
+
+    def add(self, device, name: str) -> BufferedOutput:
+        output = BufferedOutput(device, name)
+        # replaced, not appended to, since components may be built while flush() runs
+        self._outputs = self._outputs + [output]
+        TelemetryRecorder.getInstance().add(name, lambda: output.sent_value)
+        return output
+
+    def pair(self, leader: BufferedOutput, follower) -> None:
+        device = follower.device if isinstance(follower, BufferedOutput) else follower
+        if hasattr(device, "follow"):
+            device.follow(leader.device)
+        else:
+            leader.followers.append(device)
+
+    def flush(self) -> None:
+        for output in self._outputs:
+            output.flush()
+
+    def stats(self) -> dict:
+        """Writes issued and suppressed for each device, keyed by name."""
+        return {
+            output.name: {
+                "writes": output.writes,
+                "suppressed": output.suppressed,
+                "coalesced": output.coalesced
+            }
+            for output in self._outputs
+        }
@@ -0,0 +1,89 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+__all__ = ["PoseHistory"]
+
+class PoseHistory():
+    """The last capacity samples of a few named values, indexed by timestamp.
+
+    record() overwrites the oldest sample in preallocated arrays, so
+    recording allocates nothing. at() and get() answer "what was the value
+    at time t" by binary search over the ring, O(log n), and interpolate
+    linearly between the two samples around t; times outside the history
+    are clamped to the oldest or newest sample. Samples must be recorded in
+    time order.
+    """
+    __slots__ = ("fields", "capacity", "time", "_columns", "_index", "_count")
+
+    def __init__(self, fields: Sequence[str], capacity: int = 256):
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self.time = np.zeros(capacity)
+        self._columns = tuple(np.zeros(capacity) for _ in self.fields)
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def oldest(self) -> float:
+        return float(self.time[(self._index - self._count) % self.capacity]) if self._count else 0.0
+
+    @property
+    def newest(self) -> float:
+        return float(self.time[(self._index - 1) % self.capacity]) if self._count else 0.0
+
+    def clear(self) -> None:
+        self._index = 0
+        self._count = 0
+
+    def record(self, t: float, *values: float) -> None:
+        index = self._index
+        self.time[index] = t
+        for column, value in zip(self._columns, values):
+            column[index] = value
+        self._index = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def _bracket(self, t: float) -> Tuple[int, int, float]:
+        """(i, j, fraction): t lies fraction of the way from sample i to sample j."""
+        count = self._count
+        if count == 0:
+            raise IndexError("PoseHistory is empty")
+        capacity = self.capacity
+        start = (self._index - count) % capacity
+        time = self.time
+
+        # first logical position whose time is after t
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if time[(start + middle) % capacity] <= t:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == 0:
+            return start, start, 0.0
+        before = (start + low - 1) % capacity
+        if low == count:
+            return before, before, 0.0
+        after = (start + low) % capacity
+        span = time[after] - time[before]
+        return before, after, (t - time[before]) / span if span > 0 else 0.0
+
+    def get(self, field: str, t: float) -> float:
+        before, after, fraction = self._bracket(t)
+        column = self._columns[self.fields.index(field)]
+        return float(column[before] + (column[after] - column[before]) * fraction)
+
+    def at(self, t: float) -> tuple:
+        """Every field at time t, in the order of fields."""
+        before, after, fraction = self._bracket(t)
+        return tuple(
+            float(column[before] + (column[after] - column[before]) * fraction)
+            for column in self._columns
+        )
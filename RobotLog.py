@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from typing import Dict
+
+__all__ = ["RateLimitFilter", "RingBufferHandler", "setup"]
+
+# Per-component log levels, keyed by logger name.
+LEVELS = {
+    "robot": logging.INFO,
+    "robot.driver": logging.INFO,
+    "robot.gripper": logging.INFO,
+    "robot.lifter": logging.INFO,
+    "robot.auto": logging.INFO,
+    "robot.vision": logging.INFO,
+    "robot.boot": logging.INFO,
+    "robot.config": logging.INFO,
+    "robot.control": logging.INFO
+}
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets the same message from the same call site through at most once per interval.
+
+    A message is the same when both its format string and its arguments are,
+    so different values logged from one line are never dropped. Repeats
+    inside the interval are dropped and counted; the next record that gets
+    through carries the count in record.suppressed. At most MAX_SITES
+    messages are tracked at a time. Safe to use from any thread.
+    """
+    MAX_SITES = 1024
+
+    def __init__(self, interval: float = 1.0):
+        super().__init__()
+        self.interval = interval
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        args = record.args
+        try:
+            hash(args)
+        except TypeError:
+            args = repr(args)
+        key = (record.pathname, record.lineno, record.msg, args)
+        with self._lock:
+            return self._filter(key, record)
+
+    def _filter(self, key: tuple, record: logging.LogRecord) -> bool:
+        now = record.created
+        site = self._sites.get(key)
+        if site is None:
+            if len(self._sites) >= RateLimitFilter.MAX_SITES:
+                self._sites.clear()
+            self._sites[key] = [now, 0]
+            record.suppressed = 0
+            return True
+
+        if now - site[0] < self.interval:
+            site[1] += 1
+            return False
+
+        record.suppressed = site[1]
+        site[0] = now
+        site[1] = 0
+        return True
+
+
+class RingBufferHandler(logging.Handler):
+    """Hands records to a background thread through a preallocated ring buffer.
+
+    emit() only stores the record in a free slot; formatting and the actual
+    console/file writes happen on the drain thread. When the buffer is full
+    the record is dropped and counted instead of blocking the control loop.
+    Any thread may log: claiming a slot takes a short lock, which the drain
+    thread never holds.
+    """
+    DRAIN_PERIOD = 0.05
+
+    def __init__(self, targets, size: int = 1024):
+        super().__init__()
+        self.targets = targets
+        self.dropped = 0
+
+        self._slots = [None] * size
+        self._size = size
+        self._head = 0
+        self._tail = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._drain_forever, name="RobotLog", daemon=True)
+        self._thread.start()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Skip Handler.handle(); emit() takes its own, shorter lock.
+        if self.filter(record):
+            self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with self._lock:
+            tail = self._tail
+            next_tail = (tail + 1) % self._size
+            if next_tail == self._head:
+                self.dropped += 1
+                return
+            self._slots[tail] = record
+            self._tail = next_tail
+
+    def drain(self) -> None:
+        head = self._head
+        while head != self._tail:
+            record = self._slots[head]
+            self._slots[head] = None
+            head = (head + 1) % self._size
+            self._head = head
+
+            if getattr(record, "suppressed", 0):
+                record.msg = str(record.msg) + " (repeated %d times)" % record.suppressed
+            for target in self.targets:
+                if record.levelno >= target.level:
+                    target.handle(record)
+
+    def _drain_forever(self) -> None:
+        while True:
+            self.drain()
+            time.sleep(RingBufferHandler.DRAIN_PERIOD)
+
+
+_handler = None
+
+
+def setup(path: str = None, levels: Dict[str, int] = None, interval: float = 1.0) -> RingBufferHandler:
+    """Route the "robot" loggers through the ring buffer to the console and, optionally, a file.
+
+    Only the first call installs the handler; later calls return it.
+    """
+    global _handler
+    if _handler is not None:
+        return _handler
+
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    targets = [logging.StreamHandler()]
+    if path is not None:
+        targets.append(logging.FileHandler(path))
+    for target in targets:
+        target.setFormatter(formatter)
+
+    handler = RingBufferHandler(targets)
+    handler.addFilter(RateLimitFilter(interval))
+
+    root = logging.getLogger("robot")
+    root.addHandler(handler)
+    _handler = handler
+    root.propagate = False
+    for name, level in (levels or LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    return handler
@@ -0,0 +1,156 @@
+from typing import Dict, List
+from Command import Command
+from Subsystem import Subsystem
+
+__all__ = ["Scheduler"]
+
+class Scheduler():
+    """Steps every running Command once per robot tick.
+
+    AsyncRobot calls run() once per loop iteration. Commands are stepped in
+    the order they were started, so every command in a tick sees the same
+    sensor values and the cost of a tick is one pass over the active list.
+
+    Subsystem ownership is a single bitmask: each subsystem is one bit and
+    each command carries the OR of the bits it requires, so checking or
+    taking a whole set of requirements is one AND/OR. When a command needs
+    a subsystem that is already owned, it preempts the owner if its
+    priority is at least as high, otherwise it waits until the bits it
+    needs are released.
+    """
+    _instance = None
+
+    _commands: List[Command]
+    _pending: List[Command]
+    _waiting: List[Command]
+    _owners: Dict[int, Command]
+
+    def __init__(self):
+        self._commands = []
+        self._pending = []
+        self._waiting = []
+        self._owned = 0
+        self._owners = {}
+
+    @staticmethod
+    def getInstance() -> "Scheduler":
+        if Scheduler._instance is None:
+            Scheduler._instance = Scheduler()
+        return Scheduler._instance
+
+    # Private Methods
+    def _start(self, command: Command) -> None:
+        if command._interupted:
+            # Cancelled before it ever ran.
+            command._scheduled = False
+            return
+
+        conflict = command.requirements & self._owned
+        if conflict:
+            owners = self._owners_of(conflict)
+            if any([owner.priority > command.priority for owner in owners]):
+                self._waiting.append(command)
+                return
+
+            for owner in owners:
+                self._preempt(owner)
+
+        self._acquire(command)
+        command._initialize()
+        self._commands.append(command)
+
+    def _owners_of(self, mask: int) -> List[Command]:
+        owners = []
+        while mask:
+            owner = self._owners[mask & -mask]
+            owners.append(owner)
+            mask &= ~owner.requirements
+        return owners
+
+    def _acquire(self, command: Command) -> None:
+        mask = command.requirements
+        self._owned |= mask
+        while mask:
+            bit = mask & -mask
+            self._owners[bit] = command
+            mask ^= bit
+
+    def _release(self, command: Command) -> None:
+        command._scheduled = False
+
+        freed = command.requirements & self._owned
+        mask = freed
+        while mask:
+            bit = mask & -mask
+            if self._owners.get(bit) is command:
+                del self._owners[bit]
+            else:
+                freed ^= bit
+            mask ^= bit
+        if not freed:
+            return
+        self._owned &= ~freed
+
+        # Only wake the commands that were waiting on the freed subsystems.
+        if self._waiting:
+            woken = [waiter for waiter in self._waiting if waiter.requirements & freed]
+            if woken:
+                self._waiting = [waiter for waiter in self._waiting if not waiter.requirements & freed]
+                self._pending.extend(woken)
+
+    def _preempt(self, command: Command) -> None:
+        self._commands.remove(command)
+        command.cancel()
+        command._end()
+        self._release(command)
+
+        # Persistent commands go back in line for their subsystems.
+        if command.persistent:
+            command._scheduled = True
+            command._interupted = False
+            self._waiting.append(command)
+
+    # Public Methods
+    def add(self, command: Command) -> None:
+        """Schedule a command; it is initialized at the start of the next tick."""
+        if command._scheduled:
+            return
+        command._scheduled = True
+        command._interupted = False
+        self._pending.append(command)
+
+    def cancel_all(self) -> None:
+        for command in self._waiting:
+            command._scheduled = False
+        self._waiting = []
+        for command in self._commands + self._pending:
+            command.cancel()
+
+    @property
+    def running(self) -> List[Command]:
+        return self._commands
+
+    def owner(self, component) -> Command:
+        """The command currently holding a subsystem, or None."""
+        return self._owners.get(Subsystem.mask_of(component))
+
+    def run(self) -> None:
+        """Run one tick: start pending commands, then step each running one."""
+        if self._pending:
+            pending = self._pending
+            self._pending = []
+            for command in pending:
+                self._start(command)
+
+        commands = self._commands
+        ended = None
+        for command in commands:
+            if not command._tick():
+                if ended is None:
+                    ended = []
+                ended.append(command)
+
+        if ended is not None:
+            for command in ended:
+                self._release(command)
+            self._commands = [command for command in commands if command._scheduled]
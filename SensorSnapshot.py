@@ -0,0 +1,47 @@
+from typing import Callable, List
+
+__all__ = ["CachedSensor", "SensorSnapshot"]
+
+class CachedSensor():
+    """The value of one sensor as read at the start of the current tick."""
+    __slots__ = ("read", "value")
+
+    def __init__(self, read: Callable):
+        self.read = read
+        self.value = read()
+
+    def refresh(self):
+        self.value = self.read()
+        return self.value
+
+
+class SensorSnapshot():
+    """Samples every registered sensor exactly once per tick.
+
+    Components register their encoders, potentiometers, limit switches and
+    gyros with add() and read CachedSensor.value afterwards. AsyncRobot calls
+    sample() before anything else in the loop, so every command and periodic
+    function in a tick works from the same readings and each device is only
+    touched once.
+    """
+    _instance = None
+
+    _sensors: List[CachedSensor]
+
+    def __init__(self):
+        self._sensors = []
+
+    @staticmethod
+    def getInstance() -> "SensorSnapshot":
+        if SensorSnapshot._instance is None:
+            SensorSnapshot._instance = SensorSnapshot()
+        return SensorSnapshot._instance
+
+    def add(self, read: Callable) -> CachedSensor:
+        sensor = CachedSensor(read)
+        self._sensors.append(sensor)
+        return sensor
+
+    def sample(self) -> None:
+        for sensor in self._sensors:
+            sensor.value = sensor.read()
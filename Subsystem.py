@@ -1,10 +1,18 @@
-import asyncio
-
 class Subsystem():
-    SUBSYSTEM_LOCK = None
-    
+    """Something a Command can require.
+
+    Every subsystem is given one bit of the Scheduler's ownership mask the
+    first time it is seen. Components that do not subclass Subsystem can
+    still be required; they are given a bit through mask_of().
+    """
+    _masks = {}
+
     def __init__(self):
-        type(self).SUBSYSTEM_LOCK = asyncio.Condition()
-    
-    def _get_lock(self) -> asyncio.Condition:
-        return type(self).SUBSYSTEM_LOCK
\ No newline at end of file
+        self.mask = Subsystem.mask_of(self)
+
+    @staticmethod
+    def mask_of(component) -> int:
+        mask = Subsystem._masks.get(component)
+        if mask is None:
+            mask = Subsystem._masks[component] = 1 << len(Subsystem._masks)
+        return mask
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ctre import ParamEnum
+
+__all__ = ["ConfigResult", "Setting", "TalonConfig", "configure_talons"]
+
+logger = logging.getLogger("robot.config")
+
+# Timeout for every config call and read back; a nonzero timeout makes the
+# Talon report errors, the worker pool keeps the waiting off the main thread.
+TIMEOUT_MS = 10
+
+# Digest of the last configuration applied to each device, by name.
+CACHE_PATH = "talon_config_cache.json"
+
+# The Talon keeps outputs in units of 1/1023 and gains in fixed point, so
+# neither reads back exactly what was sent.
+OUTPUT_TOLERANCE = 1 / 1023
+GAIN_TOLERANCE = 0.01
+
+
+class Setting(NamedTuple):
+    """One config* call; value is its last argument before the timeout."""
+    method: str
+    args: tuple
+    # ParamEnum name to read the current value back with, if there is one.
+    param: Optional[str] = None
+    ordinal: int = 0
+    # how far the read back value may be from value and still match
+    tolerance: float = 0.5
+
+    @property
+    def value(self) -> float:
+        return self.args[-1]
+
+
+class TalonConfig(NamedTuple):
+    """Everything a Talon SRX keeps in flash, declared once per device.
+
+    Fields left as None are not touched. Outputs are (forward, reverse)
+    pairs and gains are (kF, kP, kI, kD) for slot 0.
+    """
+    feedback_sensor: Optional[int] = None
+    nominal_output: Optional[Tuple[float, float]] = None
+    peak_output: Optional[Tuple[float, float]] = None
+    allowable_error: Optional[int] = None
+    forward_soft_limit: Optional[int] = None
+    gains: Optional[Tuple[float, float, float, float]] = None
+
+    def settings(self) -> List[Setting]:
+        settings = []
+        if self.feedback_sensor is not None:
+            settings.append(Setting("configSelectedFeedbackSensor", (self.feedback_sensor, 0)))
+        if self.nominal_output is not None:
+            forward, reverse = self.nominal_output
+            settings.append(Setting("configNominalOutputForward", (forward,), "eNominalPosOutput",
+                                    tolerance=OUTPUT_TOLERANCE))
+            settings.append(Setting("configNominalOutputReverse", (reverse,), "eNominalNegOutput",
+                                    tolerance=OUTPUT_TOLERANCE))
+        if self.peak_output is not None:
+            forward, reverse = self.peak_output
+            settings.append(Setting("configPeakOutputForward", (forward,), "ePeakPosOutput",
+                                    tolerance=OUTPUT_TOLERANCE))
+            settings.append(Setting("configPeakOutputReverse", (reverse,), "ePeakNegOutput",
+                                    tolerance=OUTPUT_TOLERANCE))
+        if self.allowable_error is not None:
+            settings.append(Setting("configAllowableClosedloopError", (0, self.allowable_error),
+                                    "eProfileParamSlot_AllowableErr"))
+        if self.forward_soft_limit is not None:
+            settings.append(Setting("configForwardSoftLimitThreshold", (self.forward_soft_limit,),
+                                    "eForwardSoftLimitThreshold"))
+        if self.gains is not None:
+            for method, param, gain in zip(
+                    ("config_kF", "config_kP", "config_kI", "config_kD"),
+                    ("eProfileParamSlot_F", "eProfileParamSlot_P", "eProfileParamSlot_I", "eProfileParamSlot_D"),
+                    self.gains):
+                settings.append(Setting(method, (0, gain), param,
+                                        tolerance=max(abs(gain) * GAIN_TOLERANCE, 1e-6)))
+        return settings
+
+    def digest(self, device_id: int) -> str:
+        return hashlib.sha1(repr((device_id, tuple(self))).encode()).hexdigest()
+
+
+class ConfigResult(NamedTuple):
+    name: str
+    sent: int
+    matched: int
+    errors: int
+    cached: bool
+
+
+def _matches(talon, setting: Setting) -> bool:
+    param = getattr(ParamEnum, setting.param, None) if setting.param else None
+    if param is None:
+        return False
+    try:
+        current = talon.configGetParameter(param, setting.ordinal, TIMEOUT_MS)
+    except Exception:
+        return False
+    return abs(current - setting.value) <= setting.tolerance
+
+
+def _verify(talon, config: TalonConfig) -> bool:
+    """Whether one setting read back still matches, e.g. after a Talon swap or factory reset.
+
+    A nonzero setting is preferred, since factory defaults are mostly zero.
+    """
+    readable = [setting for setting in config.settings() if setting.param]
+    if not readable:
+        return True
+    setting = next((setting for setting in readable if setting.value), readable[0])
+    return _matches(talon, setting)
+
+
+def _configure(name: str, talon, config: TalonConfig, cached: bool) -> ConfigResult:
+    if cached and _verify(talon, config):
+        return ConfigResult(name, 0, 0, 0, True)
+    return _apply(name, talon, config)
+
+
+def _apply(name: str, talon, config: TalonConfig) -> ConfigResult:
+    sent = matched = errors = 0
+    for setting in config.settings():
+        if _matches(talon, setting):
+            matched += 1
+            continue
+        error = getattr(talon, setting.method)(*setting.args, TIMEOUT_MS)
+        sent += 1
+        if error:
+            errors += 1
+            logger.warning("%s.%s%r failed: %s", name, setting.method, setting.args, error)
+    return ConfigResult(name, sent, matched, errors, False)
+
+
+def _load_cache(path: str) -> Dict[str, str]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def configure_talons(devices: Dict[str, tuple], path: str = None, force: bool = False) -> List[ConfigResult]:
+    """Apply {name: (talon, TalonConfig)} to every device at once, one worker per device.
+
+    Devices whose configuration matches the digest cached from the last
+    successful run are skipped after reading back a single setting, which
+    catches a swapped or factory-reset Talon on the same CAN ID; force
+    skips the cache. Otherwise each setting is read back first and only
+    sent if it differs.
+    """
+    path = path or CACHE_PATH
+    cache = _load_cache(path)
+
+    results = []
+    if devices:
+        with ThreadPoolExecutor(max_workers=len(devices), thread_name_prefix="TalonConfig") as pool:
+            futures = [
+                pool.submit(_configure, name, talon, config,
+                            not force and cache.get(name) == config.digest(talon.getDeviceID()))
+                for name, (talon, config) in devices.items()
+            ]
+            results.extend(future.result() for future in futures)
+
+    if not all(result.cached for result in results):
+        for result in results:
+            if result.cached:
+                continue
+            talon, config = devices[result.name]
+            if result.errors:
+                cache.pop(result.name, None)
+            else:
+                cache[result.name] = config.digest(talon.getDeviceID())
+        try:
+            with open(path, "w") as f:
+                json.dump(cache, f, indent=1, sort_keys=True)
+        except OSError:
+            logger.exception("Could not write %s", path)
+
+    for result in results:
+        logger.info("%s: %s", result.name, "cached" if result.cached else
+                    "%d sent, %d already set, %d failed" % (result.sent, result.matched, result.errors))
+    return results
@@ -0,0 +1,69 @@
+"""Load TelemetryRecorder logs into NumPy arrays.
+
+Meant to be used off the robot:
+
+    python TelemetryReader.py telemetry/telemetry_1520000000_000.bin
+"""
+import glob
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+__all__ = ["load", "load_match"]
+
+_DTYPES = {
+    "?": "u1",
+    "b": "i1",
+    "B": "u1",
+    "h": "<i2",
+    "H": "<u2",
+    "i": "<i4",
+    "I": "<u4",
+    "q": "<i8",
+    "Q": "<u8",
+    "f": "<f4",
+    "d": "<f8"
+}
+
+
+def _read_header(data: bytes) -> tuple:
+    magic, count, length = struct.unpack_from("<4sII", data, 0)
+    if magic != b"TLM1":
+        raise ValueError("Not a telemetry log")
+    return count, json.loads(data[12:12 + length].decode())
+
+
+def load(path: str):
+    """Returns (records, header) where records is a structured array with one field per channel."""
+    with open(path, "rb") as f:
+        data = f.read()
+    count, header = _read_header(data)
+    dtype = np.dtype([(name, _DTYPES[fmt]) for name, fmt in header["fields"]])
+    records = np.frombuffer(data, dtype=dtype, count=count, offset=4096).copy()
+    return records, header
+
+
+def load_match(directory: str):
+    """Every log in a directory, oldest first, concatenated into one array."""
+    paths = sorted(glob.glob(os.path.join(directory, "telemetry_*.bin")))
+    loaded = [load(path) for path in paths]
+    if not loaded:
+        raise FileNotFoundError("No telemetry logs in " + directory)
+    records = np.concatenate([records for records, _ in loaded])
+    return records, loaded[-1][1]
+
+
+def active_commands(mask: int, header: dict) -> list:
+    """Names of the Command classes set in an active_commands mask."""
+    return [name for bit, name in enumerate(header["commands"]) if mask >> bit & 1]
+
+
+if __name__ == "__main__":
+    records, header = load(sys.argv[1])
+    print("%d records of %d bytes" % (len(records), header["record_size"]))
+    for name in records.dtype.names:
+        column = records[name]
+        print("%-24s min %-12.4g max %-12.4g" % (name, column.min(), column.max()))
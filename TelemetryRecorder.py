@@ -0,0 +1,205 @@
+import glob
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Callable, List
+
+__all__ = ["TelemetryRecorder"]
+
+logger = logging.getLogger("robot.telemetry")
+
+class TelemetryRecorder():
+    """Writes one fixed-layout binary record per tick into memory-mapped files.
+
+    Channels are registered with add(); the record layout is built from them
+    and written into the file header as JSON so TelemetryReader can load a
+    log without knowing what was recorded. add() may be called from any
+    thread, e.g. by a component built by DeferredSetup: new channels are
+    queued and only taken up by record() on the robot loop, which closes the
+    current file and starts a new one with the wider layout.
+    Records are packed straight into a preallocated mmap, so record() never
+    waits on storage. When a file is full it is handed to a background
+    thread to be flushed and closed, and the next file is started.
+
+    At most MAX_FILES files are kept in the directory, counting those left
+    by earlier runs. If a file cannot be opened, e.g. with the disk full,
+    recording stops and the error is logged; record() never raises it.
+
+    File layout: HEADER_SIZE bytes of header (magic, record count, header
+    length, JSON), followed by RECORDS_PER_FILE records of record_size bytes.
+    """
+    MAGIC = b"TLM1"
+    HEADER_SIZE = 4096
+    RECORDS_PER_FILE = 15000
+    MAX_FILES = 20
+
+    _instance = None
+
+    _names: List[str]
+    _formats: List[str]
+    _reads: List[Callable]
+
+    def __init__(self):
+        self._names = []
+        self._formats = []
+        self._reads = []
+        self._pending = []
+        self._lock = threading.Lock()
+        self._struct = None
+        self._period = None
+        self._command_names = []
+        self._command_bits = {}
+
+        self.directory = None
+        self.files = []
+        self._mmap = None
+        self._file = None
+        self._count = 0
+        self._index = 0
+
+    @staticmethod
+    def getInstance() -> "TelemetryRecorder":
+        if TelemetryRecorder._instance is None:
+            TelemetryRecorder._instance = TelemetryRecorder()
+        return TelemetryRecorder._instance
+
+    def add(self, name: str, read: Callable, fmt: str = "f") -> None:
+        """Record read() every tick as a struct field of type fmt, from the next record on."""
+        with self._lock:
+            self._pending.append((name, fmt, read))
+
+    def command_mask(self, commands) -> int:
+        """Bitmask of the Command classes in commands, one bit per class."""
+        mask = 0
+        for command in commands:
+            name = type(command).__name__
+            bit = self._command_bits.get(name)
+            if bit is None:
+                if len(self._command_names) >= 64:
+                    continue
+                bit = self._command_bits[name] = 1 << len(self._command_names)
+                self._command_names.append(name)
+            mask |= bit
+        return mask
+
+    def start(self, directory: str, period: float) -> None:
+        self.directory = directory
+        self._period = period
+        self._struct = struct.Struct("<" + "".join(self._formats))
+        os.makedirs(directory, exist_ok=True)
+        # oldest first, so earlier runs' files are pruned first
+        self.files = sorted(glob.glob(os.path.join(directory, "telemetry_*.bin")), key=os.path.getmtime)
+        self._take_pending()
+        self._open()
+
+    def record(self) -> None:
+        if self._pending and self.directory is not None:
+            # the new layout starts with this record
+            if self._mmap is not None:
+                self._finish(self._mmap, self._file)
+                self._mmap = None
+            self._take_pending()
+            try:
+                self._open()
+            except OSError:
+                self._stop_recording()
+        if self._mmap is None:
+            return
+        values = [read() for read in self._reads]
+        offset = TelemetryRecorder.HEADER_SIZE + self._count * self._struct.size
+        self._struct.pack_into(self._mmap, offset, *values)
+        self._count += 1
+        struct.pack_into("<I", self._mmap, 4, self._count)
+
+        if self._count >= TelemetryRecorder.RECORDS_PER_FILE:
+            self._rotate()
+
+    def rotate(self) -> None:
+        """Close the current file and start a new one, e.g. at the end of a match."""
+        if self._mmap is not None and self._count:
+            self._rotate()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._finish(self._mmap, self._file)
+            self._mmap = None
+
+    # Private Methods
+    def _take_pending(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for name, fmt, read in pending:
+            self._names.append(name)
+            self._formats.append(fmt)
+            self._reads.append(read)
+        self._struct = struct.Struct("<" + "".join(self._formats))
+
+    def _header(self) -> bytes:
+        header = json.dumps({
+            "fields": list(zip(self._names, self._formats)),
+            "record_size": self._struct.size,
+            "period": self._period,
+            "commands": self._command_names
+        }).encode()
+        if len(header) > TelemetryRecorder.HEADER_SIZE - 12:
+            raise ValueError("Telemetry header does not fit in HEADER_SIZE")
+        return header
+
+    def _open(self) -> None:
+        path = os.path.join(self.directory, "telemetry_%d_%03d.bin" % (int(time.time()), self._index))
+        self._index += 1
+        size = TelemetryRecorder.HEADER_SIZE + TelemetryRecorder.RECORDS_PER_FILE * self._struct.size
+
+        # make room before the new file takes its space
+        while len(self.files) >= TelemetryRecorder.MAX_FILES:
+            try:
+                os.remove(self.files.pop(0))
+            except OSError:
+                pass
+
+        file = open(path, "w+b")
+        try:
+            file.truncate(size)
+            self._mmap = mmap.mmap(file.fileno(), size)
+        except OSError:
+            file.close()
+            os.remove(path)
+            raise
+        self._file = file
+        self._count = 0
+        self._write_header(self._mmap)
+        self.files.append(path)
+
+    def _write_header(self, buffer) -> None:
+        header = self._header()
+        struct.pack_into("<4sII", buffer, 0, TelemetryRecorder.MAGIC, self._count, len(header))
+        buffer[12:12 + len(header)] = header
+
+    def _rotate(self) -> None:
+        self._finish(self._mmap, self._file)
+        self._mmap = None
+        try:
+            self._open()
+        except OSError:
+            self._stop_recording()
+
+    def _stop_recording(self) -> None:
+        logger.exception("could not open a telemetry file, recording stopped")
+        self._mmap = None
+        self._file = None
+        self.directory = None
+
+    def _finish(self, buffer, file) -> None:
+        # The header is rewritten to pick up command names seen since it was opened.
+        self._write_header(buffer)
+        threading.Thread(target=TelemetryRecorder._flush, args=(buffer, file), daemon=True).start()
+
+    @staticmethod
+    def _flush(buffer, file) -> None:
+        buffer.flush()
+        buffer.close()
+        file.close()
@@ -0,0 +1,261 @@
+"""Target detection on worker processes, fed through shared-memory frames.
+
+The capture loop grabs every frame straight into one slot of a ring of
+preallocated NumPy frames that live in shared memory, so the workers read
+them without a copy; only slot numbers and results go through the queues.
+Frames are captured at the processing resolution (the camera is set to it,
+recorded video is resized into the slot), so nothing is downscaled twice.
+Results carry the capture time and are handed to publish() newest first,
+older results that arrive late are dropped.
+
+vision.py runs this in the process CameraServer.launch() starts; the robot
+reads the published results from NetworkTables without blocking, see
+VisionComponent. benchmarks/bench_vision.py runs it on a recorded video.
+"""
+import logging
+import multiprocessing
+import queue
+import time
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+__all__ = ["CameraSource", "VideoFileSource", "VisionPipeline", "VisionResult", "detect_targets"]
+
+logger = logging.getLogger("robot.vision")
+
+# HSV range of the yellow power cube.
+LOWER_HSV = (20, 100, 100)
+UPPER_HSV = (35, 255, 255)
+# Smallest blob reported, as a fraction of the frame.
+MIN_AREA = 0.002
+MAX_TARGETS = 4
+
+
+class VisionResult(NamedTuple):
+    # time.monotonic() when the frame was captured; the same clock as the robot's
+    timestamp: float
+    frame: int
+    # (x, y, area) of each target, x and y in -1..1 from the frame centre,
+    # area as a fraction of the frame, largest first
+    targets: Tuple[Tuple[float, float, float], ...]
+    process_time: float
+
+
+class CameraSource():
+    """The first USB camera, captured at the processing resolution.
+
+    Frames are stamped with the time cscore recorded when they were
+    captured, moved onto time.monotonic(). The offset between the two
+    clocks is the smallest (monotonic - capture) gap seen so far, i.e. the
+    frame that was handed over quickest.
+    """
+
+    def __init__(self, width: int, height: int, fps: int = 30):
+        from cscore import CameraServer
+        server = CameraServer.getInstance()
+        server.enableLogging()
+        camera = server.startAutomaticCapture()
+        camera.setResolution(width, height)
+        camera.setFPS(fps)
+        self.sink = server.getVideo()
+        self._offset = float("inf")
+
+    def grab(self, out: np.ndarray) -> float:
+        """Fill out with the next frame. Returns its capture time, or 0 on failure."""
+        stamp, _ = self.sink.grabFrame(out)
+        if stamp == 0:
+            logger.warning("frame grab failed: %s", self.sink.getError())
+            return 0.0
+        # grabFrame() returns the capture time in microseconds on cscore's clock
+        captured = stamp * 1e-6
+        self._offset = min(self._offset, time.monotonic() - captured)
+        return captured + self._offset
+
+    def close(self) -> None:
+        pass
+
+
+class VideoFileSource():
+    """Frames of a recorded video, resized into the slot; loops at the end.
+
+    With realtime set, frames are paced at the video's frame rate like a
+    camera; otherwise they come as fast as they can be decoded.
+    """
+
+    def __init__(self, path: str, width: int, height: int, realtime: bool = False, loop: bool = True):
+        import cv2
+        self._cv2 = cv2
+        self._capture = cv2.VideoCapture(path)
+        if not self._capture.isOpened():
+            raise OSError("could not open video " + path)
+        self.size = (width, height)
+        self.loop = loop
+        fps = self._capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self.period = 1.0 / fps if realtime else 0.0
+        self._next = time.monotonic()
+
+    def grab(self, out: np.ndarray) -> float:
+        ok, frame = self._capture.read()
+        if not ok and self.loop:
+            self._capture.set(self._cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._capture.read()
+        if not ok:
+            return 0.0
+
+        if self.period:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next = max(self._next + self.period, time.monotonic() - self.period)
+        self._cv2.resize(frame, self.size, dst=out)
+        return time.monotonic()
+
+    def close(self) -> None:
+        self._capture.release()
+
+
+def detect_targets(frame: np.ndarray, hsv: np.ndarray, mask: np.ndarray) -> tuple:
+    """Yellow blobs in a BGR frame; hsv and mask are scratch buffers of the frame's size."""
+    import cv2
+    cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=hsv)
+    cv2.inRange(hsv, LOWER_HSV, UPPER_HSV, dst=mask)
+    contours = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+
+    height, width = mask.shape
+    frame_area = float(width * height)
+    targets = []
+    for contour in contours:
+        moments = cv2.moments(contour)
+        area = moments["m00"] / frame_area
+        if area < MIN_AREA:
+            continue
+        x = moments["m10"] / moments["m00"] / width * 2 - 1
+        y = moments["m01"] / moments["m00"] / height * 2 - 1
+        targets.append((x, y, area))
+    targets.sort(key=lambda target: target[2], reverse=True)
+    return tuple(targets[:MAX_TARGETS])
+
+
+def _frames(buffer, slots: int, height: int, width: int) -> np.ndarray:
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(slots, height, width, 3)
+
+
+def _worker(buffer, stamps, shape: tuple, detect: Callable, work, results) -> None:
+    slots, height, width = shape
+    frames = _frames(buffer, slots, height, width)
+    # scratch buffers, allocated once per worker
+    hsv = np.empty((height, width, 3), dtype=np.uint8)
+    mask = np.empty((height, width), dtype=np.uint8)
+    while True:
+        job = work.get()
+        if job is None:
+            return
+        slot, frame = job
+        start = time.perf_counter()
+        try:
+            targets = detect(frames[slot], hsv, mask)
+        except Exception:
+            logger.exception("vision worker failed")
+            targets = ()
+        results.put((slot, VisionResult(stamps[slot], frame, targets, time.perf_counter() - start)))
+
+
+class VisionPipeline():
+    """Captures frames into shared memory and detects targets on a pool of processes.
+
+    There are workers + 2 frame slots, so capture can fill one while every
+    worker holds another; when no slot is free the frame is dropped and
+    counted in dropped, capture never waits for a worker. run() captures
+    until stop(); step() captures and dispatches one frame and publishes
+    whatever results are ready. stop() waits at most STOP_TIMEOUT for the
+    workers.
+    """
+    STOP_TIMEOUT = 5.0
+
+    def __init__(self, source, width: int, height: int, workers: int = 2,
+                 publish: Callable[[VisionResult], None] = None, detect: Callable = detect_targets):
+        self.source = source
+        self.publish = publish or (lambda result: None)
+        self.frames_captured = 0
+        self.dropped = 0
+        self.published = 0
+        self.latest = None  # type: Optional[VisionResult]
+
+        slots = workers + 2
+        self._buffer = multiprocessing.RawArray("B", slots * height * width * 3)
+        self._stamps = multiprocessing.RawArray("d", slots)
+        self.frames = _frames(self._buffer, slots, height, width)
+        self._scratch = np.empty((height, width, 3), dtype=np.uint8)
+
+        self._free = list(range(slots))
+        self._work = multiprocessing.Queue()
+        self._results = multiprocessing.Queue()
+        self._workers = [
+            multiprocessing.Process(
+                target=_worker,
+                args=(self._buffer, self._stamps, (slots, height, width), detect, self._work, self._results),
+                name="vision-%d" % index,
+                daemon=True
+            )
+            for index in range(workers)
+        ]
+        self._running = False
+
+    def start(self) -> None:
+        for worker in self._workers:
+            worker.start()
+        self._running = True
+
+    def step(self) -> None:
+        self._collect(block=False)
+        if self._free:
+            slot = self._free.pop()
+            stamp = self.source.grab(self.frames[slot])
+            if stamp == 0:
+                self._free.append(slot)
+                return
+            self._stamps[slot] = stamp
+            self.frames_captured += 1
+            self._work.put((slot, self.frames_captured))
+        else:
+            # keep the source moving so results stay current
+            if self.source.grab(self._scratch):
+                self.dropped += 1
+
+    def run(self, frames: int = None) -> None:
+        if not self._running:
+            self.start()
+        while self._running and (frames is None or self.frames_captured < frames):
+            self.step()
+
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        for _ in self._workers:
+            self._work.put(None)
+        deadline = time.monotonic() + VisionPipeline.STOP_TIMEOUT
+        # a worker that died never returns its slot
+        while len(self._free) < len(self.frames) and time.monotonic() < deadline \
+                and any(worker.is_alive() for worker in self._workers):
+            self._collect(block=True)
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                logger.warning("%s did not stop, terminating it", worker.name)
+                worker.terminate()
+        self.source.close()
+
+    def _collect(self, block: bool) -> None:
+        while True:
+            try:
+                slot, result = self._results.get(block=block, timeout=1.0 if block else None)
+            except queue.Empty:
+                return
+            block = False
+            self._free.append(slot)
+            if self.latest is None or result.timestamp > self.latest.timestamp:
+                self.latest = result
+                self.published += 1
+                self.publish(result)
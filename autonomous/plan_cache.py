@@ -0,0 +1,109 @@
+import glob
+import logging
+import os
+from itertools import product
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+from wpilib import DriverStation, SendableChooser, SmartDashboard
+from Command import Command
+from CommandGroup import CommandGroup
+from autonomous.plan_format import load_compiled, build as build_plan
+from DashboardPublisher import DashboardPublisher
+
+logger = logging.getLogger("robot.auto")
+
+SIDES = ("L", "R")
+START_LOCATIONS = ("L", "M", "R")
+
+# Start location choices shown on the dashboard.
+START_CHOICES = {"Left": "L", "Middle": "M", "Right": "R"}
+
+# DriverStation.getLocation() reports the alliance station as 1-3; only a
+# guess at where the robot stands, used when nothing was chosen.
+STATION_TO_START = {1: "L", 2: "M", 3: "R"}
+
+PLAN_DIR = os.path.join(os.path.dirname(__file__), "plans")
+
+
+def validate(plan: CommandGroup) -> None:
+    """Raise ValueError if a plan cannot be run as built."""
+    if not plan._command_list:
+        raise ValueError("plan has no stages")
+    seen = set()
+    for stage in plan._command_list:
+        for command in stage:
+            if not isinstance(command, Command):
+                raise ValueError("plan stage contains a non-Command: %r" % (command,))
+            if id(command) in seen:
+                raise ValueError("the same %s instance is used twice" % type(command).__name__)
+            seen.add(id(command))
+            if isinstance(command, CommandGroup):
+                validate(command)
+
+
+class PlanCache():
+    """Every autonomous plan, built ahead of time and picked with one dict lookup.
+
+    build() constructs and validates a plan for each (start, switch, scale)
+    combination, so no commands or PID controllers are created once
+    autonomous has started. Each case comes from the JSON plan in plan_dir
+    that lists it, see autonomous/plan_format; a case listed by no plan,
+    or by two, fails the build. select() returns the plan for the game data
+    and records how long the choice took in last_select_time.
+
+    The start location is picked by the drive team from the auto/start
+    chooser on the dashboard; the alliance station is only a fallback.
+    """
+
+    _plans: Dict[Tuple[str, str, str], CommandGroup]
+
+    def __init__(self, plan_dir: str = PLAN_DIR):
+        self._plan_dir = plan_dir
+        self._plans = {}
+        self.last_select_time = 0.0
+
+        self.start_chooser = SendableChooser()
+        self.start_chooser.addDefault("Driver station", None)
+        for label, start_location in START_CHOICES.items():
+            self.start_chooser.addObject(label, start_location)
+        SmartDashboard.putData("auto/start", self.start_chooser)
+
+    def build(self) -> None:
+        start = perf_counter()
+        self._plans = {}
+        for path in sorted(glob.glob(os.path.join(self._plan_dir, "*.json"))):
+            compiled = load_compiled(path)
+            for case in compiled.cases:
+                key = tuple(case)
+                if key in self._plans:
+                    raise ValueError("%s: case %s is already covered by another plan" % (path, case))
+                # every case gets its own commands
+                plan = build_plan(compiled)
+                validate(plan)
+                self._plans[key] = plan
+
+        missing = ["".join(key) for key in product(START_LOCATIONS, SIDES, SIDES) if key not in self._plans]
+        if missing:
+            raise ValueError("no plan in %s for cases %s" % (self._plan_dir, ", ".join(missing)))
+        logger.info("built %d autonomous plans in %.1f ms", len(self._plans), (perf_counter() - start) * 1000)
+
+    def select(self, start_location: str, game_data: str) -> Optional[CommandGroup]:
+        """The plan for a start location and game-specific message, or None if the message is not in yet."""
+        start = perf_counter()
+        plan = self._plans.get((start_location, game_data[:1], game_data[1:2]))
+        self.last_select_time = perf_counter() - start
+
+        DashboardPublisher.getInstance().put("auto/plan_select_ms", self.last_select_time * 1000)
+        return plan
+
+    def chosen_start(self) -> str:
+        """The start location picked on the dashboard, else a guess from the alliance station."""
+        start_location = self.start_chooser.getSelected()
+        if start_location is None:
+            start_location = STATION_TO_START.get(DriverStation.getInstance().getLocation(), "M")
+            logger.warning("no start location chosen, guessing %s from the alliance station", start_location)
+        return start_location
+
+    def select_from_driver_station(self, start_location: str) -> Optional[CommandGroup]:
+        return self.select(start_location, DriverStation.getInstance().getGameSpecificMessage())
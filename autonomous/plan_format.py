@@ -0,0 +1,222 @@
+"""Declarative autonomous plans.
+
+A plan is a JSON file naming existing commands and their arguments:
+
+    {
+        "name": "drive_straight",
+        "cases": ["LRR", "RLL"],
+        "steps": [
+            {"parallel": [
+                {"command": "Reset"},
+                {"command": "set_low_gear"},
+                {"command": "LiftTo", "args": ["down"]},
+                {"command": "close"}
+            ]},
+            {"command": "DriveByDistance", "args": [168, 0.5]}
+        ]
+    }
+
+"cases" lists the autonomous situations the plan is run in, as start
+location, switch side and scale side (see PlanCache). Each step is one
+command or {"parallel": [...]} of commands. compile_plan()
+checks every name and argument list against the command's signature, then
+flattens the plan into a table of stages that refer to commands by index.
+build() turns that table into a CommandGroup, which steps the stages by
+index, so nothing is looked up by name once the plan is running.
+
+Compiled tables are cached next to the plan (plan.json -> plan.json.cache)
+and reused while the plan file is unchanged. Validate plans offline with:
+
+    python -m autonomous.plan_format autonomous/plans/*.json
+"""
+import hashlib
+import importlib
+import inspect
+import json
+import pickle
+import re
+import sys
+from typing import Callable, List, NamedTuple, Tuple
+
+from CommandGroup import CommandGroup
+
+__all__ = ["COMMANDS", "CompiledPlan", "PlanError", "build", "compile_plan", "load_compiled", "load_plan"]
+
+# Every command a plan may name, as "module:attribute".
+COMMANDS = {
+    "DriveByDistance": "components.DriverComponent.DriveCommands:DriveByDistance",
+    "DriveByTime": "components.DriverComponent.DriveCommands:DriveByTime",
+    "Turn": "components.DriverComponent.DriveCommands:Turn",
+    "TurnToTarget": "components.DriverComponent.DriveCommands:TurnToTarget",
+    "set_low_gear": "components.DriverComponent.DriveCommands:set_low_gear",
+    "set_high_gear": "components.DriverComponent.DriveCommands:set_high_gear",
+    "MoveToPosition": "components.LifterComponent.LifterCommands:MoveToPosition",
+    "Reset": "components.LifterComponent.LifterCommands:Reset",
+    "LiftTo": "components.GripperComponent.GripperCommands:LiftTo",
+    "SpitFast": "components.GripperComponent.GripperCommands:SpitFast",
+    "SuckFast": "components.GripperComponent.GripperCommands:SuckFast",
+    "close": "components.GripperComponent.GripperCommands:close",
+    "spread": "components.GripperComponent.GripperCommands:spread"
+}
+
+CACHE_VERSION = 2
+
+# start location, switch side, scale side
+CASE = re.compile(r"^[LMR][LR][LR]$")
+
+
+class PlanError(ValueError):
+    pass
+
+
+class CompiledPlan(NamedTuple):
+    name: str
+    source_hash: str
+    # "LRR" style (start, switch, scale) cases the plan is run in.
+    cases: Tuple[str, ...]
+    # "module:attribute" of every command the plan uses.
+    factories: Tuple[str, ...]
+    # stages[i] is a tuple of (factory index, args, kwargs) run in parallel.
+    stages: Tuple[Tuple[Tuple[int, tuple, tuple], ...], ...]
+
+
+def _resolve(target: str) -> Callable:
+    module, attribute = target.split(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+_KIND_NAMES = {dict: "an object", list: "a list", str: "a string"}
+
+
+def _expect(value, kind: type, what: str) -> None:
+    if not isinstance(value, kind):
+        raise PlanError("%s: expected %s, got %s" % (what, _KIND_NAMES[kind], type(value).__name__))
+
+
+def _compile_command(step: dict, factories: List[str], where: str) -> Tuple[int, tuple, tuple]:
+    if not isinstance(step, dict) or "command" not in step:
+        raise PlanError(where + ": expected {\"command\": ...}")
+    name = step["command"]
+    _expect(name, str, where + ": command")
+    if name not in COMMANDS:
+        raise PlanError(where + ": unknown command " + repr(name))
+
+    args = step.get("args", [])
+    _expect(args, list, where + ": args")
+    kwargs = step.get("kwargs", {})
+    _expect(kwargs, dict, where + ": kwargs")
+    args = tuple(args)
+    kwargs = tuple(sorted(kwargs.items()))
+    try:
+        inspect.signature(_resolve(COMMANDS[name])).bind(*args, **dict(kwargs))
+    except TypeError as e:
+        raise PlanError(where + ": bad arguments for " + name + ": " + str(e))
+
+    target = COMMANDS[name]
+    if target not in factories:
+        factories.append(target)
+    return factories.index(target), args, kwargs
+
+
+def compile_plan(source: bytes) -> CompiledPlan:
+    """Validate a JSON plan and flatten it into a CompiledPlan."""
+    try:
+        plan = json.loads(source.decode())
+    except ValueError as e:
+        raise PlanError("not valid JSON: " + str(e))
+    _expect(plan, dict, "plan")
+    _expect(plan.get("name", ""), str, "name")
+
+    steps = plan.get("steps")
+    if not steps:
+        raise PlanError("plan has no steps")
+    _expect(steps, list, "steps")
+
+    cases = plan.get("cases", [])
+    _expect(cases, list, "cases")
+    cases = tuple(cases)
+    for case in cases:
+        if not isinstance(case, str) or not CASE.match(case):
+            raise PlanError("bad case %r, expected start, switch and scale like \"MLR\"" % (case,))
+
+    factories = []
+    stages = []
+    for index, step in enumerate(steps):
+        where = "step %d" % index
+        if isinstance(step, dict) and "parallel" in step:
+            commands = step["parallel"]
+            _expect(commands, list, where + ": parallel")
+            if not commands:
+                raise PlanError(where + ": empty parallel step")
+            stages.append(tuple([
+                _compile_command(command, factories, where + "." + str(i))
+                for i, command in enumerate(commands)
+            ]))
+        else:
+            stages.append((_compile_command(step, factories, where),))
+
+    return CompiledPlan(
+        name=plan.get("name", ""),
+        source_hash=hashlib.sha1(source).hexdigest(),
+        cases=cases,
+        factories=tuple(factories),
+        stages=tuple(stages)
+    )
+
+
+def build(compiled: CompiledPlan) -> CommandGroup:
+    """Create the commands of a compiled plan as a CommandGroup."""
+    # plans keep their commands, so pooled factories are bypassed
+    factories = [getattr(factory, "build", factory) for factory in map(_resolve, compiled.factories)]
+    group = CommandGroup()
+    for stage in compiled.stages:
+        commands = [factories[factory](*args, **dict(kwargs)) for factory, args, kwargs in stage]
+        if len(commands) == 1:
+            group.add_sequential(commands[0])
+        else:
+            group.add_parallel(commands)
+    return group
+
+
+def load_compiled(path: str) -> CompiledPlan:
+    """The compiled table for a plan file, from its cache when the file is unchanged."""
+    with open(path, "rb") as f:
+        source = f.read()
+    source_hash = hashlib.sha1(source).hexdigest()
+
+    cache_path = path + ".cache"
+    try:
+        with open(cache_path, "rb") as f:
+            version, cached = pickle.load(f)
+        if version == CACHE_VERSION:
+            compiled = CompiledPlan(*cached)
+            if compiled.source_hash == source_hash:
+                return compiled
+    except (OSError, ValueError, TypeError, EOFError, pickle.UnpicklingError):
+        pass
+
+    compiled = compile_plan(source)
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump((CACHE_VERSION, tuple(compiled)), f)
+    except OSError:
+        pass
+    return compiled
+
+
+def load_plan(path: str) -> CommandGroup:
+    return build(load_compiled(path))
+
+
+if __name__ == "__main__":
+    failed = False
+    for path in sys.argv[1:]:
+        with open(path, "rb") as f:
+            try:
+                compiled = compile_plan(f.read())
+            except PlanError as e:
+                failed = True
+                print("%s: %s" % (path, e))
+                continue
+        print("%s: ok, %d stages, cases %s" % (path, len(compiled.stages), ", ".join(compiled.cases) or "none"))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,245 @@
+"""Cost of the command framework itself, measured headless.
+
+Every case runs stub commands that touch no hardware, so the numbers are
+the cost of the Scheduler, Command, CommandGroup and Events code alone.
+
+    python -m benchmarks.bench_framework --save benchmarks/baseline.json
+    python -m benchmarks.bench_framework --baseline benchmarks/baseline.json
+
+With --baseline the run fails when any case is slower than the baseline by
+more than --tolerance. Timings depend on the machine, so re-save
+benchmarks/baseline.json when comparing on different hardware. Neither
+wpilib nor networktables is needed.
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from time import perf_counter_ns
+
+from Command import Command, InstantCommand
+from CommandGroup import CommandGroup
+from CommandPool import CommandPool, count_allocations, pooled
+from Scheduler import Scheduler
+
+WARMUP_TICKS = 200
+
+
+class Spin(Command):
+    """Runs until it is cancelled."""
+
+    def execute(self):
+        pass
+
+
+class Once(Command):
+    """Finishes after one execute()."""
+
+    def execute(self):
+        self.finished()
+
+
+def _noop(data=None):
+    pass
+
+
+# Cases: each returns a function that runs one tick.
+def tick_commands(count: int):
+    scheduler = Scheduler()
+    for _ in range(count):
+        scheduler.add(Spin())
+    scheduler.run()
+    return scheduler.run
+
+
+def _restarting(group: Command):
+    scheduler = Scheduler()
+
+    def step():
+        if not group.is_running():
+            scheduler.add(group)
+        scheduler.run()
+    return step
+
+
+def group_sequential(stages: int):
+    group = CommandGroup()
+    for _ in range(stages):
+        group.add_sequential(Once())
+    return _restarting(group)
+
+
+def group_nested(depth: int):
+    group = CommandGroup().add_sequential(Once()).add_sequential(Once())
+    for _ in range(depth):
+        group = CommandGroup().add_sequential(group)
+    return _restarting(group)
+
+
+def group_wide(width: int):
+    group = CommandGroup()
+    group.add_parallel([Once() for _ in range(width)])
+    group.add_sequential(Once())
+    return _restarting(group)
+
+
+def contention(count: int):
+    scheduler = Scheduler()
+    shared, other = object(), object()
+    commands = []
+    for index in range(count):
+        command = Spin()
+        command.requires(shared)
+        if index % 2:
+            command.requires(other)
+        commands.append(command)
+    state = [0]
+
+    def step():
+        scheduler.add(commands[state[0] % count])
+        state[0] += 1
+        scheduler.run()
+    return step
+
+
+def instant_churn(count: int):
+    scheduler = Scheduler()
+
+    def step():
+        for _ in range(count):
+            scheduler.add(InstantCommand(_noop))
+        scheduler.run()
+    return step
+
+
+@pooled
+def _pooled_instant(index: int) -> InstantCommand:
+    return InstantCommand(_noop)
+
+
+def pooled_churn(count: int):
+    CommandPool.getInstance().clear()
+    scheduler = Scheduler()
+
+    def step():
+        for index in range(count):
+            scheduler.add(_pooled_instant(index))
+        scheduler.run()
+    return step
+
+
+def event_dispatch(listeners: int):
+    from Events import Events
+
+    events = Events()
+    events._create_event("bench")
+    for _ in range(listeners):
+        events.add_listener("bench", _noop)
+
+    def step():
+        for _ in range(10):
+            events.trigger_event("bench")
+    return step
+
+
+CASES = {
+    "tick_1_commands": (tick_commands, 1),
+    "tick_10_commands": (tick_commands, 10),
+    "tick_100_commands": (tick_commands, 100),
+    "group_10_sequential": (group_sequential, 10),
+    "group_nested_8_deep": (group_nested, 8),
+    "group_50_wide": (group_wide, 50),
+    "contention_8_commands": (contention, 8),
+    "instant_churn_10": (instant_churn, 10),
+    "pooled_churn_10": (pooled_churn, 10),
+    "events_10_listeners_x10": (event_dispatch, 10)
+}
+
+
+def measure(case, arg, ticks: int) -> dict:
+    step = case(arg)
+    for _ in range(WARMUP_TICKS):
+        step()
+    with count_allocations() as commands:
+        start = perf_counter_ns()
+        for _ in range(ticks):
+            step()
+        elapsed = perf_counter_ns() - start
+
+    # Allocation pass: bytes allocated within a tick, measured as the
+    # tracemalloc peak above the memory in use when the tick started.
+    step = case(arg)
+    for _ in range(WARMUP_TICKS):
+        step()
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(ticks):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step()
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    return {
+        "ns_per_tick": elapsed / ticks,
+        "alloc_bytes_per_tick": allocated / ticks,
+        "commands_per_tick": commands.count / ticks
+    }
+
+
+def run(ticks: int, only=None) -> dict:
+    results = {}
+    for name, (case, arg) in CASES.items():
+        if only and name not in only:
+            continue
+        try:
+            results[name] = measure(case, arg, ticks)
+        except ImportError as e:
+            print("%-26s skipped (%s)" % (name, e))
+            continue
+        result = results[name]
+        print("%-26s %12.0f ns/tick %10.0f B/tick %6.2f commands/tick" % (
+            name, result["ns_per_tick"], result["alloc_bytes_per_tick"], result["commands_per_tick"]))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Names of the cases slower than baseline by more than tolerance."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["ns_per_tick"]
+        ratio = result["ns_per_tick"] / before if before else 1.0
+        marker = "REGRESSION" if ratio > 1.0 + tolerance else ""
+        print("%-26s %6.2fx baseline %s" % (name, ratio, marker))
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("cases", nargs="*", help="only run these cases")
+    args = parser.parse_args(argv)
+
+    results = run(args.ticks, args.cases)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Throughput and latency of the vision pipeline on a recorded video, no camera needed.
+
+    python -m benchmarks.bench_vision match.mp4 --frames 600 --workers 2 --width 160 --height 120
+
+Latency is from capture to publish. With --realtime the video is paced at
+its own frame rate, like a camera; otherwise frames come as fast as they
+decode and the numbers show how much headroom the workers have.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from VisionPipeline import VideoFileSource, VisionPipeline
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=120)
+    parser.add_argument("--realtime", action="store_true")
+    args = parser.parse_args(argv)
+
+    latencies = []
+    process_times = []
+
+    def publish(result):
+        latencies.append(time.monotonic() - result.timestamp)
+        process_times.append(result.process_time)
+
+    source = VideoFileSource(args.video, args.width, args.height, realtime=args.realtime)
+    pipeline = VisionPipeline(source, args.width, args.height, args.workers, publish)
+    pipeline.start()
+    start = time.perf_counter()
+    pipeline.run(args.frames)
+    pipeline.stop()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    process_times = np.array(process_times) * 1000
+    print("%d frames in %.2f s: %.1f fps, %d dropped, %d published" % (
+        pipeline.frames_captured, elapsed, pipeline.frames_captured / elapsed, pipeline.dropped, pipeline.published))
+    if len(latencies):
+        print("latency  p50 %6.2f ms  p99 %6.2f ms  max %6.2f ms" % (
+            np.percentile(latencies, 50), np.percentile(latencies, 99), latencies.max()))
+        print("process  p50 %6.2f ms  p99 %6.2f ms  max %6.2f ms" % (
+            np.percentile(process_times, 50), np.percentile(process_times, 99), process_times.max()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
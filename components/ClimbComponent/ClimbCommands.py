@@ -1,10 +1,13 @@
 from robot_map import RobotMap
 from Command import InstantCommand
+from CommandPool import pooled
 
 
+@pooled
 def climb() -> InstantCommand:
     return InstantCommand(lambda: RobotMap.climb_component.climb())
 
 
+@pooled
 def stop() -> InstantCommand:
     return InstantCommand(lambda: RobotMap.climb_component.stop())
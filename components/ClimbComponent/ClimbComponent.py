@@ -1,10 +1,12 @@
 from wpilib import Victor
+from OutputBuffer import OutputBuffer
 
 
 class ClimberComponent:
     def __init__(self):
-        self.climb_motor_1 = Victor(2)
-        self.climb_motor_2 = Victor(5)
+        outputs = OutputBuffer.getInstance()
+        self.climb_motor_1 = outputs.add(Victor(2), "climb_motor_1")
+        self.climb_motor_2 = outputs.add(Victor(5), "climb_motor_2")
 
     def climb(self):
         self.climb_motor_1.set(-1)
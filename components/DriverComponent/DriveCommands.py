@@ -1,23 +1,34 @@
+import logging
+from math import copysign
 from robot_map import RobotMap
 from Command import Command, InstantCommand
-from wpilib.timer import Timer
+from Clock import Timer
+from CommandPool import pooled
 from control_system import ControlSystem
-from wpilib.pidcontroller import PIDController
+from ControlExecutor import ControlExecutor, ControlLoop
 from wpilib import DoubleSolenoid
+from components.DriverComponent import DriverComponent
+from MotionProfile import trapezoid
 
+logger = logging.getLogger("robot.driver")
 
+
+@pooled
 def set_low_gear() -> InstantCommand:
     return InstantCommand(RobotMap.driver_component.set_low_gear)
 
 
+@pooled
 def set_high_gear() -> InstantCommand:
     return InstantCommand(RobotMap.driver_component.set_high_gear)
 
 
+@pooled
 def toggle_gear() -> InstantCommand:
     return InstantCommand(RobotMap.driver_component.toggle_gear)
 
 
+@pooled
 def curve_drive(linear: float, angular: float) -> InstantCommand:
     return InstantCommand(lambda: RobotMap.driver_component.set_curve(linear, angular))
 
@@ -30,18 +41,17 @@ class DriveByTime(Command):
         self.timer = Timer()
 
     def on_start(self):
-        print("start driving forward by time")
+        logger.info("start driving forward by time")
         self.timer.start()
 
     def execute(self):
-        RobotMap.driver_component.set_curve(self._speed, -RobotMap.driver_component.driver_gyro.getAngle()*0.2)
+        RobotMap.driver_component.set_curve(self._speed, -RobotMap.driver_component.current_angle*0.2)
         if self.timer.hasPeriodPassed(self._target_seconds):
             RobotMap.driver_component.set_curve(0, 0)
-            RobotMap.driver_component.neutralMotors()
             self.finished()
 
     def on_end(self):
-        print("end driving forward by time")
+        logger.info("end driving forward by time")
         self.timer.stop()
         self.timer.reset()
 
@@ -54,78 +64,142 @@ angular_tolerance = 2
 
 
 class DriveByDistance(Command):
+    """Drives a trapezoidal profile to inches, topping out at speed.
+
+    Measured from the odometry pose when the command starts, holding the
+    heading the previous move aimed for, so no sensors are reset. Output
+    never drops below MIN_OUTPUT until the robot is within TOLERANCE of the
+    distance; a timeout of 0 gives up SETTLE_TIME after the profile ends.
+    """
+    # proportional correction on profile position error, per inch
+    kP = 0.02
+    # inches short of the distance that count as arrived
+    TOLERANCE = 1.0
+    # just above the drive motors' deadband
+    MIN_OUTPUT = 0.12
+    SETTLE_TIME = 1.5
+
     def __init__(self, inches: float, speed: float, timeout:float = 0):
         super().__init__()
         angular_gains = (0.02, 0.0001, 0.02, 0.0)
         linear_gains = (0.02, 0.0, 0.0, 0.0)
         self._target_distance = inches
         self._speed = speed
-        self._angular = 0
 
-        self.angular_controller = PIDController(*angular_gains, RobotMap.driver_component.driver_gyro, output=self)
-        self.angular_controller.setInputRange(-360, 360)
-        self.angular_controller.setOutputRange(-1, 1)
-        self.angular_controller.setAbsoluteTolerance(0.5)
+        self.angular_controller = ControlLoop("drive_heading", RobotMap.odometry_component.current_heading,
+                                              *angular_gains, tolerance=0.5)
+        self._start_distance = 0.0
 
-        self.angular_controller.setSetpoint(0)
+        self._profile = trapezoid(inches, abs(speed) * DriverComponent.MAX_VELOCITY, DriverComponent.MAX_ACCELERATION)
 
-        self._timeout = timeout
+        self._timeout = timeout or self._profile.duration + DriveByDistance.SETTLE_TIME
         self.timer = Timer()
 
-    def pidWrite(self, output):
-        self._angular = output
-
     def on_start(self):
+        self.timer.reset()
         self.timer.start()
 
-        RobotMap.driver_component.reset_drive_sensors()
-
-        self.angular_controller.enable()
+        odometry = RobotMap.odometry_component
+        self._start_distance = odometry.pose.distance
+        self.angular_controller.setpoint = odometry.target_heading
+        ControlExecutor.getInstance().add(self.angular_controller)
 
     def execute(self):
-        if abs(RobotMap.driver_component.current_distance) >= abs(self._target_distance) or (self._timeout != 0 and self.timer.hasPeriodPassed(self._timeout)):
-            RobotMap.driver_component.drive_train.curvatureDrive(0, 0, False)
-            RobotMap.driver_component.neutralMotors()
+        t = self.timer.get()
+        distance = RobotMap.odometry_component.pose.distance - self._start_distance
+        remaining = self._target_distance - distance
+        arrived = copysign(1.0, self._target_distance) * remaining <= DriveByDistance.TOLERANCE
+        if arrived or t > self._timeout:
+            if not arrived:
+                logger.warning("drive by distance timed out %.1f in short", remaining)
+            RobotMap.driver_component.set_curve(0, 0)
             self.finished()
             return
 
-        RobotMap.driver_component.drive_train.curvatureDrive(self._speed, self._angular, False)
+        position, velocity, _ = self._profile.sample(t)
+        linear = velocity / DriverComponent.MAX_VELOCITY + DriveByDistance.kP * (position - distance)
+        linear = max(-abs(self._speed), min(abs(self._speed), linear))
+        # keep pushing through the deadband until the distance is reached
+        if abs(linear) < DriveByDistance.MIN_OUTPUT:
+            linear = copysign(DriveByDistance.MIN_OUTPUT, remaining)
+        RobotMap.driver_component.set_curve(linear, self.angular_controller.output)
 
     def on_end(self):
         self.timer.stop()
-        self.angular_controller.disable()
+        ControlExecutor.getInstance().remove(self.angular_controller)
 
 
 class Turn(Command):
+    """Turns by degrees from the heading the previous move aimed for."""
+
     def __init__(self, degrees: float, speed: float):
         super().__init__()
         angular_gains = (0.0125, 0.00005, 0.01, 0.0)
         self._target_angle = degrees
         self._speed = speed
-        self._angular = 0
 
-        self.angular_controller = PIDController(*angular_gains, RobotMap.driver_component.driver_gyro, output=self)
-        self.angular_controller.setInputRange(-360, 360)
-        self.angular_controller.setOutputRange(-1, 1)
-        self.angular_controller.setAbsoluteTolerance(1)
+        self.angular_controller = ControlLoop("turn", RobotMap.odometry_component.current_heading,
+                                              *angular_gains, tolerance=1)
 
-        self.angular_controller.setSetpoint(degrees)
+    def on_start(self):
+        odometry = RobotMap.odometry_component
+        odometry.target_heading += self._target_angle
+        self.angular_controller.setpoint = odometry.target_heading
+        ControlExecutor.getInstance().add(self.angular_controller)
 
-    def pidWrite(self, output):
-        self._angular = output
+    def execute(self):
+        if self.angular_controller.on_target():
+            RobotMap.driver_component.set_curve(0, 0)
+            self.finished()
+            return
+        RobotMap.driver_component.set_curve(0, self.angular_controller.output)
+
+    def on_end(self):
+        ControlExecutor.getInstance().remove(self.angular_controller)
+        logger.info("done turning")
+
+
+class TurnToTarget(Command):
+    """Turns to face the largest vision target.
+
+    The target's offset is added to the heading the robot had when its
+    frame was captured, taken from the odometry history, so the vision
+    latency does not make the turn overshoot.
+    """
+    # CHANGE THESE VALUES
+    CAMERA_HALF_FOV = 30.0
+    # results older than this (s) are ignored
+    MAX_AGE = 0.5
+
+    def __init__(self):
+        super().__init__()
+        angular_gains = (0.0125, 0.00005, 0.01, 0.0)
+        self.angular_controller = ControlLoop("turn_to_target", RobotMap.odometry_component.current_heading,
+                                              *angular_gains, tolerance=1)
+        self._timestamp = 0.0
 
     def on_start(self):
-        RobotMap.driver_component.reset_drive_sensors()
-        self.angular_controller.enable()
+        self._timestamp = 0.0
+        self.angular_controller.setpoint = RobotMap.odometry_component.pose.heading
+        ControlExecutor.getInstance().add(self.angular_controller)
 
     def execute(self):
-        if self.angular_controller.onTarget():
-            RobotMap.driver_component.drive_train.curvatureDrive(0, 0, False)
-            RobotMap.driver_component.neutralMotors()
+        vision = RobotMap.vision_component
+        if vision.timestamp != self._timestamp and vision.age < TurnToTarget.MAX_AGE:
+            targets = vision.targets
+            if targets:
+                self._timestamp = vision.timestamp
+                heading = RobotMap.odometry_component.heading_at(vision.timestamp)
+                self.angular_controller.setpoint = heading + targets[0][0] * TurnToTarget.CAMERA_HALF_FOV
+
+        if self._timestamp and self.angular_controller.on_target():
+            RobotMap.driver_component.set_curve(0, 0)
+            # later moves chain from the heading the target was at
+            RobotMap.odometry_component.target_heading = self.angular_controller.setpoint
             self.finished()
             return
-        RobotMap.driver_component.drive_train.curvatureDrive(0, self._angular, True)
+        RobotMap.driver_component.set_curve(0, self.angular_controller.output)
 
     def on_end(self):
-        self.angular_controller.disable()
-        print("done turning")
+        ControlExecutor.getInstance().remove(self.angular_controller)
+        logger.info("done turning to target")
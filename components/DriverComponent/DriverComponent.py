@@ -12,15 +12,24 @@ from wpilib import \
     Compressor, \
     AnalogInput, \
     Ultrasonic, \
-    PIDController
+    PIDController, \
+    Encoder
 from ctre import WPI_TalonSRX, FeedbackDevice, RemoteSensorSource, PigeonIMU, ParamEnum, ControlMode, NeutralMode
 from wpilib.drive import DifferentialDrive
 from Command import InstantCommand, Command
 from wpilib.timer import Timer
 from enum import Enum, auto
 import math
+import logging
+from DashboardPublisher import DashboardPublisher
 from Events import Events
 from pid_helpers import Gains, PIDOutput, PIDSource
+from SensorSnapshot import SensorSnapshot
+from OutputBuffer import OutputBuffer
+from TelemetryRecorder import TelemetryRecorder
+
+logger = logging.getLogger("robot.driver")
+
 
 class GearMode:
     OFF = auto()
@@ -29,37 +38,100 @@ class GearMode:
 
 
 class DriverComponent(Events):
+    class EVENTS:
+        driving = "driving"
+
+    # Drive train limits used for motion profiles (inches/s, inches/s^2)
+    # CHANGE THESE VALUES
+    MAX_VELOCITY = 120.0
+    MAX_ACCELERATION = 100.0
+
+    # Drive encoder DIO channels and inches per pulse (6 in wheel, 360 CPR)
+    # CHANGE THESE VALUES
+    LEFT_ENCODER_CHANNELS = (3, 4)
+    RIGHT_ENCODER_CHANNELS = (5, 6)
+    INCHES_PER_PULSE = math.pi * 6 / 360
 
     def __init__(self):
-        self.left_front = Talon()
-        self.left_rear = Talon()
-        self.right_front = Talon()
-        self.right_rear = Talon()
-        
-        self.gear_solenoid = DoubleSolenoid()
+        Events.__init__(self)
+        outputs = OutputBuffer.getInstance()
+        self.left_front = outputs.add(Talon(), "left_front")
+        self.left_rear = outputs.add(Talon(), "left_rear")
+        self.right_front = outputs.add(Talon(), "right_front")
+        self.right_rear = outputs.add(Talon(), "right_rear")
+
+        # rear motors mirror the front ones
+        outputs.pair(self.left_front, self.left_rear)
+        outputs.pair(self.right_front, self.right_rear)
+
+        self.gear_solenoid = outputs.add(DoubleSolenoid(), "gear_solenoid")
+        self._gear = GearMode.OFF
         
-        #self.driver_gyro = ADXRS450_Gyro()
+        self.driver_gyro = ADXRS450_Gyro()
+        self.left_encoder = Encoder(*DriverComponent.LEFT_ENCODER_CHANNELS)
+        self.right_encoder = Encoder(*DriverComponent.RIGHT_ENCODER_CHANNELS, True)
+        for encoder in (self.left_encoder, self.right_encoder):
+            encoder.setDistancePerPulse(DriverComponent.INCHES_PER_PULSE)
+
+        sensors = SensorSnapshot.getInstance()
+        self._angle = sensors.add(self.driver_gyro.getAngle)
+        self._left = sensors.add(self.left_encoder.getDistance)
+        self._right = sensors.add(self.right_encoder.getDistance)
+
+        telemetry = TelemetryRecorder.getInstance()
+        telemetry.add("gyro_angle", lambda: self._angle.value)
+        telemetry.add("left_distance", lambda: self._left.value)
+        telemetry.add("right_distance", lambda: self._right.value)
+
+        DashboardPublisher.getInstance().add("drive/high_gear", lambda: self._gear is GearMode.HIGH, 0.25)
 
         self._create_event(DriverComponent.EVENTS.driving)
 
     def set_curve(self, linear, angular):
-        sf = abs(linear) + abs(angular)
+        sf = max(1.0, abs(linear) + abs(angular))
 
         self.left_front.set((linear + angular)/sf)
         self.right_front.set((linear - angular)/sf)
-        self.right_rear.set((linear - angular)/sf)
-        self.left_rear.set((linear + angular)/sf)
+
+    @property
+    def current_angle(self) -> float:
+        return self._angle.value
+
+    @property
+    def left_distance(self) -> float:
+        return self._left.value
+
+    @property
+    def right_distance(self) -> float:
+        return self._right.value
+
+    @property
+    def current_distance(self) -> float:
+        return (self._left.value + self._right.value) / 2
+
+    def reset_drive_sensors(self):
+        self.driver_gyro.reset()
+        self.left_encoder.reset()
+        self.right_encoder.reset()
+        self._angle.value = 0
+        self._left.value = 0
+        self._right.value = 0
+
+    def current_gear(self):
+        return self._gear
 
     def toggle_gear(self):
         if self.current_gear() is GearMode.LOW:
             self.set_high_gear()
-        if self.current_gear() is GearMode.HIGH:
+        else:
             self.set_low_gear()
 
     def set_low_gear(self):
-        print("shift low")
+        logger.info("shift low")
         self.gear_solenoid.set(DoubleSolenoid.Value.kReverse)
+        self._gear = GearMode.LOW
 
     def set_high_gear(self):
-        print("shift high")
+        logger.info("shift high")
         self.gear_solenoid.set(DoubleSolenoid.Value.kForward)
+        self._gear = GearMode.HIGH
@@ -1,21 +1,30 @@
+import logging
 from robot_map import RobotMap
 from Command import InstantCommand, Command
-from wpilib.timer import Timer
+from Clock import Timer
+from CommandPool import pooled
+from ControlExecutor import ControlExecutor, ControlLoop
 from .GripperComponent import GripperComponent
 
+logger = logging.getLogger("robot.gripper")
 
+
+@pooled
 def move_left_right(speed: float) -> InstantCommand:
     return InstantCommand(lambda: RobotMap.gripper_component.set_motor_speeds(speed, speed))
 
 
+@pooled
 def suck() -> InstantCommand:
     return InstantCommand(lambda: RobotMap.gripper_component.set_motor_speeds(1, 1))
 
 
+@pooled
 def spit() -> InstantCommand:
     return InstantCommand(lambda: RobotMap.gripper_component.set_motor_speeds(-1, -1))
 
 
+@pooled
 def stop() -> InstantCommand:
     return InstantCommand(lambda: RobotMap.gripper_component.set_motor_speeds(0, 0))
 
@@ -28,6 +37,10 @@ class SuckFast(Command):
     def on_start(self):
         self.timer.start()
 
+    def on_reset(self):
+        self.timer.stop()
+        self.timer.reset()
+
     def execute(self):
         RobotMap.gripper_component.set_motor_speeds(1, 1)
         if self.timer.hasPeriodPassed(0.4):
@@ -46,7 +59,7 @@ class SpitFast(Command):
 
     def on_start(self):
         self.timer.start()
-        print("started spit")
+        logger.info("started spit")
 
     def execute(self):
         RobotMap.gripper_component.set_motor_speeds(self._speed, self._speed)
@@ -57,52 +70,60 @@ class SpitFast(Command):
     def on_end(self):
         self.timer.stop()
         self.timer.reset()
-        print("ended spit")
+        logger.info("ended spit")
 
 
+@pooled
 def spread() -> InstantCommand:
     return InstantCommand(lambda: RobotMap.gripper_component.set_spread_state(True))
 
 
+@pooled
 def close() -> InstantCommand:
     return InstantCommand(lambda: RobotMap.gripper_component.set_spread_state(False))
 
 
+@pooled
 def toggle_spread() -> InstantCommand:
     return InstantCommand(lambda: RobotMap.gripper_component.toggle_spread_state())
 
 
+def lift_loop(tolerance: float) -> ControlLoop:
+    # a positive motor speed lowers the pot reading; saturates at half speed
+    # past 0.02 of error, like the old bang-bang control
+    return ControlLoop("gripper_lift", RobotMap.gripper_component.pot.get, -25.0, 0.0, 0.0,
+                       output_range=(-0.5, 0.5), tolerance=tolerance)
+
+
 class LiftTo(Command):
 
     def __init__(self, pos: str):
         super().__init__()
         self._target_pos = GripperComponent.lift_positions[pos]
-        self._speed = 0
+        self._loop = lift_loop(0.02)
 
     def on_start(self):
         RobotMap.gripper_component.trigger_event(GripperComponent.EVENTS.gripper_started_moving, data=self)
         RobotMap.gripper_component.add_listener(GripperComponent.EVENTS.gripper_started_moving, self.check_if_in_use)
+        self._loop.setpoint = self._target_pos
+        ControlExecutor.getInstance().add(self._loop)
 
     def check_if_in_use(self, data: GripperComponent.EVENTS.gripper_started_moving_data):
         if self != data:
             self.interrupt()
 
     def on_interrupted(self):
-        print("interupted LiftTo")
+        logger.info("interupted LiftTo")
 
     def execute(self):
-        if -0.02 < RobotMap.gripper_component.pot.get() - self._target_pos < 0.02:
+        if self._loop.on_target():
             RobotMap.gripper_component.set_lift_motor(0)
             self.finished()
             return
-        diff = RobotMap.gripper_component.pot.get() - self._target_pos
-        if diff == 0:
-            self._speed = 0
-        else:
-            self._speed = (abs(diff) / diff) * 0.50
-        RobotMap.gripper_component.set_lift_motor(self._speed)
+        RobotMap.gripper_component.set_lift_motor(self._loop.output)
 
     def on_end(self):
+        ControlExecutor.getInstance().remove(self._loop)
         RobotMap.gripper_component.remove_listener(GripperComponent.EVENTS.gripper_started_moving, self.check_if_in_use)
 
 class Toggle(Command):
@@ -110,7 +131,7 @@ class Toggle(Command):
     def __init__(self):
         super().__init__()
         self._target_pos = None
-        self._speed = 0
+        self._loop = lift_loop(0.01)
 
     def on_start(self):
         RobotMap.gripper_component.trigger_event(GripperComponent.EVENTS.gripper_started_moving, data=self)
@@ -120,35 +141,29 @@ class Toggle(Command):
             self._target_pos = GripperComponent.lift_positions["down"]
         else:
             self._target_pos = GripperComponent.lift_positions["up"]
-        self._speed = 0
+        self._loop.setpoint = self._target_pos
+        ControlExecutor.getInstance().add(self._loop)
 
-
-        current_pos_s = "current: " + current_pos + str(RobotMap.gripper_component.pot.get())
-        target_s = "target: " + str(self._target_pos)
-        speed_s = "speed: " + str(self._speed)
-        print("start toggle " + current_pos_s + " | " + target_s + " | " + speed_s)
+        logger.info("start toggle current: %s%s | target: %s",
+                    current_pos, RobotMap.gripper_component.lift_position, self._target_pos)
 
     def check_if_in_use(self, data: GripperComponent.EVENTS.gripper_started_moving_data):
         if self != data:
-            print("self: {} | data: {}".format(self, data))
+            logger.info("self: %s | data: %s", self, data)
             self.interrupt()
 
     def on_interrupted(self):
-        print("interupted toggle")
+        logger.info("interupted toggle")
 
     def execute(self):
-        print("grip execute | current: " + str(RobotMap.gripper_component.pot.get()) + " | target: " + str(self._target_pos))
-        if -0.01 < RobotMap.gripper_component.pot.get() - self._target_pos < 0.01:
+        logger.debug("grip execute | current: %s | target: %s", RobotMap.gripper_component.lift_position, self._target_pos)
+        if self._loop.on_target():
             RobotMap.gripper_component.set_lift_motor(0)
             self.finished()
             return
-        diff = RobotMap.gripper_component.pot.get() - self._target_pos
-        if diff == 0:
-            self._speed = 0
-        else:
-            self._speed = (abs(diff) / diff) * 0.50
-        RobotMap.gripper_component.set_lift_motor(self._speed)
+        RobotMap.gripper_component.set_lift_motor(self._loop.output)
 
     def on_end(self):
+        ControlExecutor.getInstance().remove(self._loop)
         RobotMap.gripper_component.remove_listener(GripperComponent.EVENTS.gripper_started_moving, self.check_if_in_use)
-        print("toggle end")
+        logger.info("toggle end")
@@ -11,8 +11,16 @@ from wpilib import \
     Victor, \
     Compressor, \
     AnalogInput
+import logging
 from Events import Events
 from Command import Command
+from DashboardPublisher import DashboardPublisher
+from SensorSnapshot import SensorSnapshot
+from OutputBuffer import OutputBuffer
+from TelemetryRecorder import TelemetryRecorder
+
+logger = logging.getLogger("robot.gripper")
+
 
 class GripperComponent(Events):
 
@@ -30,16 +38,23 @@ class GripperComponent(Events):
 
     def __init__(self):
         Events.__init__(self)
-        self.left_motor = Victor(0)
-        self.right_motor = Victor(1)
-        self.solenoid = DoubleSolenoid(2, 3)
-        self.lift_motor = Victor(4)
+        outputs = OutputBuffer.getInstance()
+        self.left_motor = outputs.add(Victor(0), "gripper_left")
+        self.right_motor = outputs.add(Victor(1), "gripper_right")
+        self.solenoid = outputs.add(DoubleSolenoid(2, 3), "gripper_solenoid")
+        self.lift_motor = outputs.add(Victor(4), "gripper_lift")
         self.pot = AnalogPotentiometer(0)
+        self._pot = SensorSnapshot.getInstance().add(self.pot.get)
+        TelemetryRecorder.getInstance().add("gripper_pot", lambda: self._pot.value)
 
         # state
         self._lift_state = None
         self._spread_state = None
 
+        dashboard = DashboardPublisher.getInstance()
+        dashboard.add("gripper/pot", lambda: self._pot.value, epsilon=0.005)
+        dashboard.add("gripper/spread", lambda: bool(self._spread_state), 0.25)
+
         # setup events
         self._create_event(GripperComponent.EVENTS.gripper_started_moving)
 
@@ -62,11 +77,15 @@ class GripperComponent(Events):
         self.right_motor.set(-right)
 
     def set_lift_motor(self, speed):
-        print("grip_speed: {}".format(str(speed)))
+        logger.debug("grip_speed: %s", speed)
         self.lift_motor.set(speed)
 
     def current_lift_state(self) -> str:
         positions = [(key, position) for key, position in GripperComponent.lift_positions.items()]
-        return min(positions, key=lambda position: abs(self.pot.get() - position[1]))[0]
+        return min(positions, key=lambda position: abs(self.lift_position - position[1]))[0]
+
+    @property
+    def lift_position(self) -> float:
+        return self._pot.value
 
 
@@ -0,0 +1,113 @@
+from math import floor, sqrt
+
+from MotionProfile import MotionProfile, trapezoid
+
+__all__ = ["LiftPlan", "move_time", "plan_lift"]
+
+# Distances are rounded to this many inches so repeated moves reuse profiles.
+RESOLUTION = 0.5
+
+
+class LiftPlan():
+    """Synchronized elevator and carriage profiles for one lift move."""
+    __slots__ = ("elevator_start", "elevator", "carriage_start", "carriage", "predicted_time")
+
+    def __init__(self, elevator_start: float, elevator: MotionProfile,
+                 carriage_start: float, carriage: MotionProfile, predicted_time: float):
+        self.elevator_start = elevator_start
+        self.elevator = elevator
+        self.carriage_start = carriage_start
+        self.carriage = carriage
+        self.predicted_time = predicted_time
+
+    def setpoints(self, t: float) -> tuple:
+        """(elevator, carriage) heights at time t."""
+        elevator = self.elevator.position[self.elevator.index(t)]
+        carriage = self.carriage.position[self.carriage.index(t)]
+        return self.elevator_start + elevator, self.carriage_start + carriage
+
+    def is_done(self, t: float) -> bool:
+        return self.elevator.is_done(t) and self.carriage.is_done(t)
+
+    @property
+    def targets(self) -> tuple:
+        """(elevator, carriage) heights at the end of the move."""
+        return self.elevator_start + self.elevator.distance, self.carriage_start + self.carriage.distance
+
+    def at_target(self, elevator: float, carriage: float, tolerance: float) -> bool:
+        """Whether both stages are within tolerance inches of where the plan ends."""
+        elevator_target, carriage_target = self.targets
+        return abs(elevator - elevator_target) <= tolerance and abs(carriage - carriage_target) <= tolerance
+
+
+def move_time(distance: float, v_max: float, a_max: float) -> float:
+    """Duration of the trapezoidal move trapezoid() would build."""
+    d = abs(distance)
+    if d == 0:
+        return 0.0
+    if d * a_max <= v_max * v_max:
+        return 2 * sqrt(d / a_max)
+    return d / v_max + v_max / a_max
+
+
+def _velocity_for(distance: float, duration: float, v_max: float, a_max: float) -> float:
+    """Cruise velocity that makes a move over distance take duration."""
+    d = abs(distance)
+    if d == 0 or duration <= 0:
+        return v_max
+    # duration = d / v + v / a, smaller root
+    discriminant = a_max * a_max * duration * duration - 4 * a_max * d
+    if discriminant <= 0:
+        return min(v_max, sqrt(d * a_max))
+    # Rounded down to 0.1 in/s so the profile cache gets reused.
+    return min(v_max, max(0.1, floor((a_max * duration - sqrt(discriminant)) / 2 * 10) / 10))
+
+
+def _round(distance: float) -> float:
+    return round(distance / RESOLUTION) * RESOLUTION
+
+
+def plan_lift(height: float, elevator: float, carriage: float,
+              elevator_max: float, carriage_max: float,
+              elevator_limits: tuple, carriage_limits: tuple) -> LiftPlan:
+    """Split height between the two stages so both arrive at the same time.
+
+    elevator and carriage are the current stage heights, *_max their travel
+    limits and *_limits their (v_max, a_max). The split that minimizes the
+    slower stage's move time is found by golden-section search (the slower
+    time is unimodal in the split), then the faster stage is slowed down to
+    finish with it.
+    """
+    e_v, e_a = elevator_limits
+    c_v, c_a = carriage_limits
+
+    low = max(0.0, height - carriage_max)
+    high = min(elevator_max, height)
+    if low > high:
+        # Out of reach: get as close as both stages allow.
+        low = high = elevator_max if height > elevator_max else 0.0
+
+    def slower(split: float) -> float:
+        return max(move_time(split - elevator, e_v, e_a), move_time(height - split - carriage, c_v, c_a))
+
+    ratio = (sqrt(5) - 1) / 2
+    a, b = low, high
+    for _ in range(40):
+        if b - a < 0.01:
+            break
+        x1 = b - ratio * (b - a)
+        x2 = a + ratio * (b - a)
+        if slower(x1) <= slower(x2):
+            b = x2
+        else:
+            a = x1
+    split = min(high, max(low, (a + b) / 2))
+
+    elevator_distance = _round(split - elevator)
+    carriage_distance = _round(min(carriage_max, max(0.0, height - split)) - carriage)
+
+    duration = max(move_time(elevator_distance, e_v, e_a), move_time(carriage_distance, c_v, c_a))
+    elevator_profile = trapezoid(elevator_distance, _velocity_for(elevator_distance, duration, e_v, e_a), e_a)
+    carriage_profile = trapezoid(carriage_distance, _velocity_for(carriage_distance, duration, c_v, c_a), c_a)
+
+    return LiftPlan(elevator, elevator_profile, carriage, carriage_profile, duration)
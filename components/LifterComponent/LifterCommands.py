@@ -1,8 +1,15 @@
+import logging
 from robot_map import RobotMap
 from Command import InstantCommand, Command
+from Clock import Timer
+from CommandPool import pooled
+from DashboardPublisher import DashboardPublisher
 from components.LifterComponent import LifterComponent
 
+logger = logging.getLogger("robot.lifter")
 
+
+@pooled
 def lock_carriage_move_elevator(speed: float) -> InstantCommand:
     def move():
         RobotMap.lifter_component.set_carriage_speed(-1)
@@ -10,6 +17,7 @@ def lock_carriage_move_elevator(speed: float) -> InstantCommand:
     return InstantCommand(move)
 
 
+@pooled
 def move_lifter(speed: float) -> InstantCommand:
     def move_lifter_sync():
         RobotMap.lifter_component.set_elevator_speed(speed)
@@ -18,31 +26,62 @@ def move_lifter(speed: float) -> InstantCommand:
 
 
 class MoveToPosition(Command):
+    """Moves the lifter to a named position, both stages arriving together.
+
+    Finishes once the plan is over and both stages are within
+    PLAN_TOLERANCE of its end heights, or PLAN_SETTLE_TIME after that if
+    they never settle. Reports the planned and the actual move time on finish, under
+    lifter/predicted_time and lifter/actual_time.
+    """
+
     def __init__(self, position: str):
         super().__init__()
         self._position = position
         self._target_position = LifterComponent.positions[position]
+        self._plan = None
+        self.timer = Timer()
 
     def on_start(self):
         # start moving towards the target
-        RobotMap.lifter_component.lift_to_distance(self._target_position)
+        self._plan = RobotMap.lifter_component.plan_to(self._target_position)
+        self.timer.reset()
+        self.timer.start()
         # check if another command is trying to move the lifter
         # RobotMap.lifter_component.add_listener(LifterComponent.EVENTS.on_control_move, self.interrupt)
         # RobotMap.lifter_component.add_listener(LifterComponent.EVENTS.on_manual_move, self.interrupt)
-        print("start move to position command "+ self._position)
+        logger.info("start move to position command %s", self._position)
 
     def execute(self):
-        if RobotMap.lifter_component.is_at_distance(self._target_position):
+        t = self.timer.get()
+        lifter = RobotMap.lifter_component
+        lifter.follow(self._plan, t)
+        if not self._plan.is_done(t):
+            return
+        arrived = self._plan.at_target(lifter.current_elevator_position, lifter.current_carriage_position,
+                                       LifterComponent.PLAN_TOLERANCE)
+        if arrived or t > self._plan.predicted_time + LifterComponent.PLAN_SETTLE_TIME:
+            if not arrived:
+                logger.warning("lift to %s did not settle, ending anyway", self._position)
             self.finished()
 
+    def _report_time(self):
+        actual = self.timer.get()
+        dashboard = DashboardPublisher.getInstance()
+        dashboard.put("lifter/predicted_time", self._plan.predicted_time)
+        dashboard.put("lifter/actual_time", actual)
+        logger.info("lift to %s took %.2f s, planned %.2f s", self._position, actual, self._plan.predicted_time)
+
     def on_end(self):
+        self.timer.stop()
         if not self._interupted:
+            self._report_time()
             RobotMap.lifter_component.stop_lift()
         # RobotMap.lifter_component.remove_listener(LifterComponent.EVENTS.on_control_move, self.interrupt)
         # RobotMap.lifter_component.remove_listener(LifterComponent.EVENTS.on_manual_move, self.interrupt)
-        print("end move to position command")
+        logger.info("end move to position command")
 
 
+@pooled
 def move_to_position_instant(position: str) -> InstantCommand:
     return InstantCommand(lambda: RobotMap.lifter_component.lift_to_distance(LifterComponent.positions[position]))
 
@@ -63,43 +102,47 @@ class Reset(Command):
         self.speed = -speed
 
     def on_start(self):
-        print("start reset command")
+        logger.info("start reset command")
 
     def execute(self):
         RobotMap.lifter_component.set_elevator_speed(self.speed)
         RobotMap.lifter_component.set_carriage_speed(self.speed)
-        if RobotMap.lifter_component.elevator_bottom_switch.get() \
-                and RobotMap.lifter_component.carriage_bottom_switch.get():
+        if RobotMap.lifter_component.elevator_at_bottom \
+                and RobotMap.lifter_component.carriage_at_bottom:
             RobotMap.lifter_component.reset_sensors()
             self.finished()
 
     def on_end(self):
-        print("end reset command")
+        logger.info("end reset command")
 
 
-class MoveUp(Command):
+class MoveUp(MoveToPosition):
     def __init__(self):
-        super().__init__()
-        self._target_position = None
+        super().__init__("floor")
 
     def on_start(self):
-        self._target_position = LifterComponent.positions[RobotMap.lifter_component.next_position()]
+        self._position = RobotMap.lifter_component.next_position()
+        self._target_position = LifterComponent.positions[self._position]
+        super().on_start()
 
-    def execute(self):
-        RobotMap.lifter_component.lift_to_distance(self._target_position)
-        if RobotMap.lifter_component.is_at_distance(self._target_position):
-            self.finished()
+    def on_end(self):
+        # keep holding the new position
+        self.timer.stop()
+        if not self._interupted:
+            self._report_time()
 
 
-class MoveDown(Command):
+class MoveDown(MoveToPosition):
     def __init__(self):
-        super().__init__()
-        self._target_position = None
+        super().__init__("floor")
 
     def on_start(self):
-        self._target_position = LifterComponent.positions[RobotMap.lifter_component.prev_position()]
+        self._position = RobotMap.lifter_component.prev_position()
+        self._target_position = LifterComponent.positions[self._position]
+        super().on_start()
 
-    def execute(self):
-        RobotMap.lifter_component.lift_to_distance(self._target_position)
-        if RobotMap.lifter_component.is_at_distance(self._target_position):
-            self.finished()
+    def on_end(self):
+        # keep holding the new position
+        self.timer.stop()
+        if not self._interupted:
+            self._report_time()
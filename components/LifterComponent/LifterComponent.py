@@ -11,8 +11,18 @@ from wpilib import \
     Victor, \
     Compressor, \
     AnalogInput
+import logging
 from ctre import WPI_TalonSRX, NeutralMode, FeedbackDevice, ControlMode, TalonSRX
+from DashboardPublisher import DashboardPublisher
+from DeferredSetup import DeferredSetup
 from Events import Events
+from SensorSnapshot import SensorSnapshot
+from OutputBuffer import OutputBuffer
+from TalonConfig import TalonConfig, configure_talons
+from TelemetryRecorder import TelemetryRecorder
+from .LiftPlanner import LiftPlan, plan_lift
+
+logger = logging.getLogger("robot.lifter")
 
 
 class LifterComponent(Events):
@@ -24,10 +34,22 @@ class LifterComponent(Events):
     ELEVATOR_MULTIPLIER = 2102.35 / 3631.33
     CARRIAGE_MULTIPLIER = 1.0 - ELEVATOR_MULTIPLIER
 
+    # Height added to every lift_to_distance() target.
+    HEIGHT_OFFSET = 6
+
+    # Lift limits used for motion profiles (inches/s, inches/s^2)
+    # CHANGE THESE VALUES
+    LIFT_MAX_VELOCITY = 40.0
+    LIFT_MAX_ACCELERATION = 80.0
+
     # Max heights of each stage.
     ELEVATOR_MAX_HEIGHT = 40
     CARRIAGE_MAX_HEIGHT = 40
 
+    # Per-stage (v_max, a_max), split by the same RPM ratio as the multipliers.
+    ELEVATOR_LIMITS = (LIFT_MAX_VELOCITY * ELEVATOR_MULTIPLIER, LIFT_MAX_ACCELERATION)
+    CARRIAGE_LIMITS = (LIFT_MAX_VELOCITY * CARRIAGE_MULTIPLIER, LIFT_MAX_ACCELERATION)
+
     # Conversion factors (counts to inches)
     # CHANGE THESE VALUES
     ELEVATOR_CONV_FACTOR = 0.00134
@@ -49,9 +71,31 @@ class LifterComponent(Events):
 
     # ALLOWABLE_ERROR = 2
 
+    # Inches from a plan's end heights that count as arrived; wider than the
+    # 2 in the Talons are allowed to settle short by.
+    PLAN_TOLERANCE = 3
+    # Seconds past a plan's predicted time before a move gives up settling.
+    PLAN_SETTLE_TIME = 1.0
+
     CARRIAGE_ALLOWABLE_ERROR = int(2 / CARRIAGE_CONV_FACTOR)
     ELEVATOR_ALLOWABLE_ERROR = int(2 / ELEVATOR_CONV_FACTOR)
 
+    # Settings the Talons keep in flash; see configure().
+    # Current limit and voltage compensation are still to be tuned.
+    ELEVATOR_CONFIG = TalonConfig(
+        feedback_sensor=FeedbackDevice.CTRE_MagEncoder_Relative,
+        nominal_output=(ELEVATOR_ZERO, ELEVATOR_ZERO),
+        peak_output=(el_up, el_down),
+        allowable_error=ELEVATOR_ALLOWABLE_ERROR,
+        forward_soft_limit=int(ELEVATOR_MAX_HEIGHT / ELEVATOR_CONV_FACTOR),
+        gains=(ELEVATOR_kF, ELEVATOR_kP, ELEVATOR_kI, ELEVATOR_kD)
+    )
+    # the carriage runs on the elevator's outputs and gains
+    CARRIAGE_CONFIG = ELEVATOR_CONFIG._replace(
+        allowable_error=CARRIAGE_ALLOWABLE_ERROR,
+        forward_soft_limit=int(CARRIAGE_MAX_HEIGHT / CARRIAGE_CONV_FACTOR)
+    )
+
     # positions = {
     #     "floor": 2.0,
     #     "portal": 34.0,
@@ -71,95 +115,68 @@ class LifterComponent(Events):
 
     def __init__(self):
         Events.__init__(self)
-        self.elevator_motor = WPI_TalonSRX(5)
+        outputs = OutputBuffer.getInstance()
+        self.elevator_motor = outputs.add(WPI_TalonSRX(5), "elevator_motor")
         self.elevator_bottom_switch = DigitalInput(9)
 
-        self.carriage_motor = WPI_TalonSRX(3)
+        self.carriage_motor = outputs.add(WPI_TalonSRX(3), "carriage_motor")
         self.carriage_bottom_switch = DigitalInput(1)
         self.carriage_top_switch = DigitalInput(2)
 
+        # fired several times per tick while moving; listeners hear them once a tick
         self._create_events([
             LifterComponent.EVENTS.on_control_move,
             LifterComponent.EVENTS.on_manual_move
-        ])
+        ], coalesce=True)
 
         self._is_reset = False
 
-        # configure elevator motor and encoder
+        # sample every lifter sensor once per tick
+        sensors = SensorSnapshot.getInstance()
+        self._elevator_position = sensors.add(lambda: self.elevator_motor.getSelectedSensorPosition(0))
+        self._carriage_position = sensors.add(lambda: self.carriage_motor.getSelectedSensorPosition(0))
+        self._elevator_bottom = sensors.add(self.elevator_bottom_switch.get)
+        self._carriage_bottom = sensors.add(self.carriage_bottom_switch.get)
+        self._carriage_top = sensors.add(self.carriage_top_switch.get)
 
-        self.elevator_motor.setNeutralMode(NeutralMode.Brake)
+        telemetry = TelemetryRecorder.getInstance()
+        telemetry.add("elevator_position", lambda: self.current_elevator_position)
+        telemetry.add("carriage_position", lambda: self.current_carriage_position)
 
-        self.elevator_motor.configSelectedFeedbackSensor(FeedbackDevice.CTRE_MagEncoder_Relative, 0, LifterComponent.TIMEOUT_MS)
+        dashboard = DashboardPublisher.getInstance()
+        dashboard.add("lifter/elevator_position", lambda: self.current_elevator_position, epsilon=0.1)
+        dashboard.add("lifter/carriage_position", lambda: self.current_carriage_position, epsilon=0.1)
+        dashboard.add("lifter/at_bottom", lambda: bool(self.elevator_at_bottom and self.carriage_at_bottom), 0.25)
 
+        # not kept by the Talons across a reboot, so set before anything moves
+        self.elevator_motor.setNeutralMode(NeutralMode.Brake)
         self.elevator_motor.setSensorPhase(True)
         self.elevator_motor.setInverted(True)
-
-        self.elevator_motor.configNominalOutputForward(LifterComponent.ELEVATOR_ZERO, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.configNominalOutputReverse(LifterComponent.ELEVATOR_ZERO, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.configPeakOutputForward(LifterComponent.el_up, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.configPeakOutputReverse(LifterComponent.el_down, LifterComponent.TIMEOUT_MS)
-
-        self.elevator_motor.configNominalOutputForward(LifterComponent.ELEVATOR_ZERO, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.configNominalOutputReverse(LifterComponent.ELEVATOR_ZERO, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.configPeakOutputForward(LifterComponent.el_up, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.configPeakOutputReverse(LifterComponent.el_down, LifterComponent.TIMEOUT_MS)
-
-        self.elevator_motor.configAllowableClosedloopError(0, LifterComponent.ELEVATOR_ALLOWABLE_ERROR, LifterComponent.TIMEOUT_MS)
-
-        self.elevator_motor.configForwardSoftLimitThreshold(int(LifterComponent.ELEVATOR_MAX_HEIGHT / LifterComponent.ELEVATOR_CONV_FACTOR), 0)
-
-        self.elevator_motor.config_kF(0, LifterComponent.ELEVATOR_kF, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.config_kP(0, LifterComponent.ELEVATOR_kP, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.config_kI(0, LifterComponent.ELEVATOR_kI, LifterComponent.TIMEOUT_MS)
-        self.elevator_motor.config_kD(0, LifterComponent.ELEVATOR_kD, LifterComponent.TIMEOUT_MS)
-
-        # self.elevator_motor.setCurrentLimit()
-        # self.elevator_motor.EnableCurrentLimit()
-        # self.elevator_motor.configVoltageCompSaturation(4, LifterComponent.TIMEOUT_MS)
-
-        # configure carriage motor and encoder
-
         self.carriage_motor.setNeutralMode(NeutralMode.Brake)
-
-        self.carriage_motor.configSelectedFeedbackSensor(FeedbackDevice.CTRE_MagEncoder_Relative, 0, LifterComponent.TIMEOUT_MS)
-
         self.carriage_motor.setSensorPhase(True)
         self.carriage_motor.setInverted(True)
 
-        self.carriage_motor.configNominalOutputForward(LifterComponent.ELEVATOR_ZERO, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.configNominalOutputReverse(LifterComponent.ELEVATOR_ZERO, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.configPeakOutputForward(LifterComponent.el_up, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.configPeakOutputReverse(LifterComponent.el_down, LifterComponent.TIMEOUT_MS)
-
-        self.carriage_motor.configNominalOutputForward(LifterComponent.ELEVATOR_ZERO, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.configNominalOutputReverse(LifterComponent.ELEVATOR_ZERO, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.configPeakOutputForward(LifterComponent.el_up, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.configPeakOutputReverse(LifterComponent.el_down, LifterComponent.TIMEOUT_MS)
-
-        self.carriage_motor.configAllowableClosedloopError(0, LifterComponent.CARRIAGE_ALLOWABLE_ERROR, LifterComponent.TIMEOUT_MS)
-
-        self.carriage_motor.configForwardSoftLimitThreshold(int(LifterComponent.CARRIAGE_MAX_HEIGHT / LifterComponent.CARRIAGE_CONV_FACTOR), 0)
-
-        self.carriage_motor.config_kF(0, LifterComponent.ELEVATOR_kF, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.config_kP(0, LifterComponent.ELEVATOR_kP, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.config_kI(0, LifterComponent.ELEVATOR_kI, LifterComponent.TIMEOUT_MS)
-        self.carriage_motor.config_kD(0, LifterComponent.ELEVATOR_kD, LifterComponent.TIMEOUT_MS)
+        # everything else is kept in the Talons' flash and can wait until after boot
+        DeferredSetup.getInstance().defer("lifter_config", self.configure)
 
-        # self.carriage_motor.setCurrentLimit()
-        # self.carriage_motor.EnableCurrentLimit()
-        # self.carriage_motor.configVoltageCompSaturation(4, LifterComponent.TIMEOUT_MS)
+    def configure(self):
+        """Bring both Talons' persistent settings in line with ELEVATOR_CONFIG and CARRIAGE_CONFIG."""
+        configure_talons({
+            "elevator_motor": (self.elevator_motor.device, LifterComponent.ELEVATOR_CONFIG),
+            "carriage_motor": (self.carriage_motor.device, LifterComponent.CARRIAGE_CONFIG)
+        })
 
     def set_elevator_speed(self, speed):
         if (speed > 0 and self.current_elevator_position >= LifterComponent.ELEVATOR_MAX_HEIGHT - 2) \
-                or (speed < 0 and self.elevator_bottom_switch.get()):
+                or (speed < 0 and self.elevator_at_bottom):
             self.elevator_motor.set(0)
         else:
             self.elevator_motor.set(speed)
         self.trigger_event(LifterComponent.EVENTS.on_manual_move)
 
     def set_carriage_speed(self, speed):
-        if (speed > 0 and self.carriage_top_switch.get()) \
-                or (speed < 0 and self.carriage_bottom_switch.get()):
+        if (speed > 0 and self._carriage_top.value) \
+                or (speed < 0 and self.carriage_at_bottom):
             self.carriage_motor.set(0)
         else:
             self.carriage_motor.set(speed)
@@ -168,15 +185,25 @@ class LifterComponent(Events):
     def reset_sensors(self):
         self.carriage_motor.setSelectedSensorPosition(0, 0, LifterComponent.TIMEOUT_MS)
         self.elevator_motor.setSelectedSensorPosition(0, 0, LifterComponent.TIMEOUT_MS)
+        self._carriage_position.value = 0
+        self._elevator_position.value = 0
         self._is_reset = True
 
+    @property
+    def elevator_at_bottom(self) -> bool:
+        return self._elevator_bottom.value
+
+    @property
+    def carriage_at_bottom(self) -> bool:
+        return self._carriage_bottom.value
+
     @property
     def current_elevator_position(self) -> float:
-        return self.elevator_motor.getSelectedSensorPosition(0) * LifterComponent.ELEVATOR_CONV_FACTOR
+        return self._elevator_position.value * LifterComponent.ELEVATOR_CONV_FACTOR
 
     @property
     def current_carriage_position(self) -> float:
-        return self.carriage_motor.getSelectedSensorPosition(0) * LifterComponent.CARRIAGE_CONV_FACTOR
+        return self._carriage_position.value * LifterComponent.CARRIAGE_CONV_FACTOR
 
     @property
     def current_position(self) -> float:
@@ -197,18 +224,34 @@ class LifterComponent(Events):
             self.trigger_event(LifterComponent.EVENTS.on_control_move)
 
     def lift_to_distance(self, inches):
-        i = inches + 6
+        i = inches + LifterComponent.HEIGHT_OFFSET
         elevator = min(i * LifterComponent.ELEVATOR_MULTIPLIER, LifterComponent.ELEVATOR_MAX_HEIGHT)
         carriage = i - elevator
 
-        print("lift_to_distance carriage" + str(carriage))
-        print("lift_to_distance elevate" + str(elevator))
-        print("lift_to_distance lifter" + str(carriage + elevator))
+        logger.debug("lift_to_distance carriage %s elevate %s lifter %s", carriage, elevator, carriage + elevator)
 
         self.elevator_to_target_position(elevator)
         self.carriage_to_target_position(carriage)
         self.trigger_event(LifterComponent.EVENTS.on_control_move)
 
+    def plan_to(self, inches: float) -> LiftPlan:
+        """Synchronized elevator and carriage profiles from here to inches."""
+        return plan_lift(
+            inches + LifterComponent.HEIGHT_OFFSET,
+            self.current_elevator_position,
+            self.current_carriage_position,
+            LifterComponent.ELEVATOR_MAX_HEIGHT,
+            LifterComponent.CARRIAGE_MAX_HEIGHT,
+            LifterComponent.ELEVATOR_LIMITS,
+            LifterComponent.CARRIAGE_LIMITS
+        )
+
+    def follow(self, plan: LiftPlan, t: float):
+        """Send both stages their setpoints for time t of a plan."""
+        elevator, carriage = plan.setpoints(t)
+        self.elevator_to_target_position(elevator)
+        self.carriage_to_target_position(carriage)
+
     def is_at_position(self, position: str) -> bool:
         return self.is_at_distance(LifterComponent.positions[position])
 
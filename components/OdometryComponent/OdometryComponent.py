@@ -0,0 +1,141 @@
+import logging
+import math
+import threading
+import time
+from typing import NamedTuple
+from Clock import Clock
+from PoseHistory import PoseHistory
+from TelemetryRecorder import TelemetryRecorder
+from robot_map import RobotMap
+
+logger = logging.getLogger("robot.driver")
+
+
+class Pose(NamedTuple):
+    time: float
+    # inches from where reset() was called, x forward at that moment
+    x: float
+    y: float
+    # gyro degrees, clockwise positive
+    heading: float
+    # inches driven along the path, forward positive
+    distance: float
+
+
+class OdometryComponent:
+    """Field-relative pose of the drive train, integrated faster than the robot loop.
+
+    A background thread reads both encoders and the gyro every PERIOD and
+    integrates them into an (x, y, heading) Pose. Each new Pose is an
+    immutable tuple swapped into pose in one assignment, so the robot loop
+    reads a consistent snapshot without a lock. Every Pose also goes into
+    a PoseHistory, for measurements that arrive late; the history is
+    overwritten in place, so heading_at() and distance_at() read it under
+    the lock.
+
+    Sensors are never reset between autonomous steps. target_heading is
+    the heading the last move aimed for; moves chain from it, so the error
+    of one step does not carry into the next.
+    """
+    PERIOD = 0.005
+    # ~5 s of poses at PERIOD
+    HISTORY_SIZE = 1024
+
+    def __init__(self):
+        self.driver = RobotMap.driver_component
+        self.clock = Clock.getInstance()
+        self.history = PoseHistory(("x", "y", "heading", "distance"), OdometryComponent.HISTORY_SIZE)
+
+        self.pose = Pose(self.clock.now(), 0.0, 0.0, 0.0, 0.0)
+        self.target_heading = 0.0
+        self.samples = 0
+
+        self._origin_heading = 0.0
+        self._last_left = None
+        self._last_right = None
+        # held while the pose and history change; pose readers never need it
+        self._lock = threading.Lock()
+
+        telemetry = TelemetryRecorder.getInstance()
+        telemetry.add("pose_x", lambda: self.pose.x)
+        telemetry.add("pose_y", lambda: self.pose.y)
+        telemetry.add("pose_heading", lambda: self.pose.heading)
+
+        self._reset = True
+        self._thread = threading.Thread(target=self._run, name="Odometry", daemon=True)
+        self._thread.start()
+
+    def reset(self) -> None:
+        """Make the current position the origin and the current heading 0, e.g. at the start of autonomous.
+
+        Takes effect before it returns, so commands started right after see the new origin.
+        """
+        with self._lock:
+            self._reset = True
+            self.target_heading = 0.0
+            self._update()
+
+    def update(self) -> Pose:
+        """Read the sensors once and integrate them into the pose."""
+        with self._lock:
+            return self._update()
+
+    def _update(self) -> Pose:
+        driver = self.driver
+        now = self.clock.now()
+        left = driver.left_encoder.getDistance()
+        right = driver.right_encoder.getDistance()
+        heading = driver.driver_gyro.getAngle()
+
+        pose = self.pose
+        if self._reset:
+            self._reset = False
+            self._origin_heading = heading
+            self.history.clear()
+            pose = Pose(now, 0.0, 0.0, 0.0, 0.0)
+            self._last_left, self._last_right = left, right
+        heading -= self._origin_heading
+
+        # arc approximation: move along the average of the old and new heading
+        moved = ((left - self._last_left) + (right - self._last_right)) / 2
+        angle = math.radians((pose.heading + heading) / 2)
+        pose = Pose(
+            now,
+            pose.x + moved * math.cos(angle),
+            pose.y + moved * math.sin(angle),
+            heading,
+            pose.distance + moved
+        )
+        self._last_left, self._last_right = left, right
+
+        self.pose = pose
+        self.history.record(now, pose.x, pose.y, pose.heading, pose.distance)
+        self.samples += 1
+        return pose
+
+    def _run(self) -> None:
+        period = OdometryComponent.PERIOD
+        deadline = time.monotonic()
+        while True:
+            try:
+                self.update()
+            except Exception:
+                logger.exception("odometry update failed")
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()
+
+    def current_heading(self) -> float:
+        """Heading of the latest pose; a sensor source for ControlLoops."""
+        return self.pose.heading
+
+    def heading_at(self, t: float) -> float:
+        with self._lock:
+            return self.history.get("heading", t)
+
+    def distance_at(self, t: float) -> float:
+        with self._lock:
+            return self.history.get("distance", t)
@@ -0,0 +1 @@
+from .OdometryComponent import OdometryComponent
@@ -1,12 +1,18 @@
 from robot_map import RobotMap
 from Command import InstantCommand, Command
-from wpilib.timer import Timer
+from Clock import Timer
+from CommandPool import pooled
 from components.ShooterComponent import ShooterComponent
 
+@pooled
+def toggle_lifter() -> InstantCommand:
+    return InstantCommand(lambda: RobotMap.shooter_component.toggle_lifter())
+
+
 class Shoot(Command):
     
     def __init__(self):
-        super.__init__()
+        super().__init__()
         self.timer = Timer()
 
     def on_start(self):
@@ -5,17 +5,24 @@ from wpilib import \
     SmartDashboard, \
     SpeedControllerGroup, \
     Talon
+from DashboardPublisher import DashboardPublisher
 
 class ShooterComponent():
+    # PCM (forward, reverse) channels, clear of the gripper's 2/3
+    # CHANGE THESE VALUES
+    LAUNCHER_CHANNELS = (4, 5)
+    LIFTER_CHANNELS = (6, 7)
+
     def __init__(self):
         self.lower_shooter = Talon()
         self.upper_shooter = Talon()
         self.intake = Relay(0, Relay.Direction.kReverse)
 
-        self.launcher = DoubleSolenoid(,)
-        self.lifter = DoubleSolenoid(,)
+        self.launcher = DoubleSolenoid(*ShooterComponent.LAUNCHER_CHANNELS)
+        self.lifter = DoubleSolenoid(*ShooterComponent.LIFTER_CHANNELS)
 
         self.should_lift = False
+        DashboardPublisher.getInstance().add("shooter/lifted", lambda: self.should_lift, 0.25)
     
     def enable_intake(self):
         self.intake.set(Relay.Value.kOn)
@@ -24,10 +31,10 @@ class ShooterComponent():
         self.intake.set(Relay.Value.kOff)
     
     def engage_launcher(self):
-        self.lifter.set(DoubleSolenoid.Value.kForward)
+        self.launcher.set(DoubleSolenoid.Value.kForward)
     
     def retract_launcher(self):
-        self.lifter.set(DoubleSolenoid.Value.kReverse)
+        self.launcher.set(DoubleSolenoid.Value.kReverse)
 
     def toggle_lifter(self):
         self.should_lift = not self.should_lift
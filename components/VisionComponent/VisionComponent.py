@@ -0,0 +1,40 @@
+import logging
+from networktables import NetworkTables
+from Clock import Clock
+from SensorSnapshot import SensorSnapshot
+from TelemetryRecorder import TelemetryRecorder
+
+logger = logging.getLogger("robot.vision")
+
+
+class VisionComponent:
+    """Latest targets published by the vision process (see vision.py).
+
+    Read from NetworkTables once per tick through the SensorSnapshot, so
+    reading them never waits on the vision process.
+    """
+
+    def __init__(self):
+        table = NetworkTables.getTable("vision")
+        sensors = SensorSnapshot.getInstance()
+        self._targets = sensors.add(lambda: table.getNumberArray("targets", ()))
+        self._timestamp = sensors.add(lambda: table.getNumber("timestamp", 0.0))
+
+        TelemetryRecorder.getInstance().add("vision_age", lambda: self.age)
+
+    @property
+    def targets(self) -> list:
+        """(x, y, area) of each target, largest first; x and y in -1..1 from the centre."""
+        values = self._targets.value
+        return [tuple(values[i:i + 3]) for i in range(0, len(values) - 2, 3)]
+
+    @property
+    def timestamp(self) -> float:
+        """When the frame the targets came from was captured, on the robot's monotonic clock."""
+        return self._timestamp.value
+
+    @property
+    def age(self) -> float:
+        if not self._timestamp.value:
+            return float("inf")
+        return Clock.getInstance().now() - self._timestamp.value
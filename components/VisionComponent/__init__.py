@@ -0,0 +1 @@
+from .VisionComponent import VisionComponent
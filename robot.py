@@ -1,61 +1,97 @@
-from wpilib import run, Joystick, SmartDashboard, CameraServer, SendableChooser
-from utilities import truncate_float, normalize_range
+from BootProfiler import BootProfiler
+# time every import from here on
+BootProfiler.getInstance().install()
+
+from wpilib import run, CameraServer
 from AsyncRobot import AsyncRobot
-from CommandGroup import CommandGroup
-from Command import Command, InstantCommand
+from CommandPool import pooled
+from DeferredSetup import DeferredSetup
+from JoystickInput import JoystickInput
 from robot_map import RobotMap
-from components.DriverComponent import DriverComponent
-from components.DriverComponent.DriveCommands import DriveByTime, DriveByDistance, Turn, curve_drive, toggle_gear
-from components.LifterComponent.LifterCommands import move_lifter, MoveUp, MoveDown, move_down_instant, move_up_instant, Reset, MoveToPosition, move_to_position_instant, lock_carriage_move_elevator
-from components.GripperComponent.GripperCommands import move_left_right, toggle_spread, SpitFast, LiftTo, Toggle, close, spread, SuckFast
-from components.ShooterComponent.ShooterCommands import Shoot
-from autonomous.switch_scale import switch_scale, drive_straight
-from components.ClimbComponent.ClimbCommands import climb, stop
+from TelemetryRecorder import TelemetryRecorder
+from components.DriverComponent.DriveCommands import toggle_gear
+from components.ShooterComponent.ShooterCommands import Shoot, toggle_lifter
+from autonomous.plan_cache import PlanCache
 
 
 class UltimateAscent(AsyncRobot):
+    # button -> command or command factory, started when the button is pressed;
+    # use (target, When.RELEASED / When.HELD) for other edges
+    BINDINGS = {
+        # Square to toggle gear
+        RobotMap.square: toggle_gear,
+        # X to fire
+        RobotMap.x: pooled(Shoot),
+        # Circle to toggle height
+        RobotMap.circle: toggle_lifter
+    }
+
     def __init__(self):
         super().__init__()
 
     # Create motors and stuff here
     def robotInit(self):
-        self.driver = Joystick(0)
-        CameraServer.launch('vision.py:main')
+        self.driver = JoystickInput(0)
+        self.driver.bind_all(UltimateAscent.BINDINGS)
+
+        telemetry = TelemetryRecorder.getInstance()
+        telemetry.add("left_y", lambda: self.driver.axis(RobotMap.left_y))
+        telemetry.add("right_x", lambda: self.driver.axis(RobotMap.right_x))
+        telemetry.add("r_2", lambda: self.driver.axis(RobotMap.r_2))
+        telemetry.add("buttons", lambda: self.driver.buttons, "I")
+        telemetry.add("pov", lambda: self.driver.pov, "h")
+
+        self.auto_plans = PlanCache()
+        self.auto_plan = None
+        self.start_location = None
+
+        # the drive train is needed the moment the robot is enabled, the rest can wait
+        deferred = DeferredSetup.getInstance()
+        for component in RobotMap.components():
+            if component.name == "driver_component":
+                component.build()
+            else:
+                deferred.defer(component.name, component.build)
+        deferred.defer("auto_plans", self.auto_plans.build)
+        deferred.defer("camera", lambda: CameraServer.launch('vision.py:main'))
 
     def robotPeriodic(self):
         pass
 
     def autonomousInit(self):
-        pass
+        DeferredSetup.getInstance().ensure("auto_plans")
+        # the one place the pose is zeroed; moves chain from here on
+        RobotMap.odometry_component.reset()
+        self.start_location = self.auto_plans.chosen_start()
+        self.auto_plan = None
+        self.start_auto_plan()
 
     def autonomousPeriodic(self):
-        pass
+        # the game-specific message can arrive after autonomous starts
+        if self.auto_plan is None:
+            self.start_auto_plan()
+
+    def start_auto_plan(self):
+        self.auto_plan = self.auto_plans.select_from_driver_station(self.start_location)
+        if self.auto_plan is not None:
+            self.start_command(self.auto_plan)
 
     def teleopInit(self):
         pass
     
     def teleopPeriodic(self):
+        driver = self.driver
+        driver.dispatch()
+
         # Driving
-        linear = -self.driver.getRawAxis(RobotMap.left_y)
-        angular = self.driver.getRawAxis(RobotMap.right_x)
+        linear = -driver.axis(RobotMap.left_y)
+        angular = driver.axis(RobotMap.right_x)
         RobotMap.driver_component.set_curve(linear, angular)
 
-        # Square to toggle gear
-        if self.driver.getRawButtonPressed(RobotMap.square):
-            RobotMap.driver_component.toggle_gear()
-        
         # Shooting (R2)
-        launch_speed = -self.driver.getRawAxis(RobotMap.r_2)
+        launch_speed = -driver.axis(RobotMap.r_2)
         RobotMap.shooter_component.shoot(launch_speed)
 
-        # X to fire
-        if self.driver.getRawButtonPressed(RobotMap.x):
-            self.start_command(Shoot())
-
-        # Circle to toggle height
-        if self.driver.getRawButtonPressed(RobotMap.circle):
-            RobotMap.shooter_component.toggle_lifter()
-
 if __name__ == '__main__':
     print("hello world")
     run(UltimateAscent)
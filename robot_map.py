@@ -1,8 +1,4 @@
-from components.ClimbComponent import ClimberComponent
-from components.DriverComponent import DriverComponent
-from components.GripperComponent import GripperComponent
-from components.LifterComponent import LifterComponent
-from components.ShooterComponent import ShooterComponent
+from LazyComponent import LazyComponent
 
 class RobotMap:
     left_y = 1
@@ -18,5 +14,15 @@ class RobotMap:
     
     touchpad = 14
 
-    driver_component = DriverComponent()
-    shooter_component = ShooterComponent()
+    # built on first use, see LazyComponent
+    driver_component = LazyComponent("components.DriverComponent:DriverComponent")
+    shooter_component = LazyComponent("components.ShooterComponent:ShooterComponent")
+    lifter_component = LazyComponent("components.LifterComponent:LifterComponent")
+    gripper_component = LazyComponent("components.GripperComponent:GripperComponent")
+    climb_component = LazyComponent("components.ClimbComponent:ClimberComponent")
+    vision_component = LazyComponent("components.VisionComponent:VisionComponent")
+    odometry_component = LazyComponent("components.OdometryComponent:OdometryComponent")
+
+    @staticmethod
+    def components() -> list:
+        return [value for value in vars(RobotMap).values() if isinstance(value, LazyComponent)]
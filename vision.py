@@ -1,8 +1,27 @@
-from cscore import CameraServer
+from networktables import NetworkTables
+from VisionPipeline import CameraSource, VisionPipeline, VisionResult
 
-def main():
-    cs = CameraServer.getInstance()
-    cs.enableLogging()
+# Processing resolution; the camera is set to it so frames are never resized.
+WIDTH = 160
+HEIGHT = 120
+WORKERS = 2
+
+
+def publisher():
+    table = NetworkTables.getTable("vision")
 
-    cs.startAutomaticCapture()
-    cs.waitForever()
+    def publish(result: VisionResult):
+        table.putNumberArray("targets", [value for target in result.targets for value in target])
+        table.putNumber("timestamp", result.timestamp)
+        table.putNumber("frame", result.frame)
+        table.putNumber("process_ms", result.process_time * 1000)
+        NetworkTables.flush()
+    return publish
+
+
+def main():
+    pipeline = VisionPipeline(CameraSource(WIDTH, HEIGHT), WIDTH, HEIGHT, WORKERS, publisher())
+    try:
+        pipeline.run()
+    finally:
+        pipeline.stop()